@@ -5,27 +5,72 @@ Kontrollerar varför forecast_precipitation_2h = 0 när weather_symbol = 18
 """
 
 import sys
-import os
-import json
-sys.path.append('modules')
+import logging
+import argparse
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from datetime import timedelta
 
-from weather_client import WeatherClient
+from modules.weather_client import WeatherClient
+from modules.smhi_iter import iter_forecasts, load_json_file, cached_smhi_forecast, make_time_ctx
 
-def debug_forecast_extraction():
-    """Detaljerad analys av SMHI forecast data"""
+# Per-prognos-tabeller loggas på DEBUG (--verbose); annars byggs de inte alls
+logger = logging.getLogger('smhi_debug')
+
+def _smhi_time_key(dt, ceil=True):
+    """
+    Formatera UTC-datetime som SMHI validTime för strängjämförelse
+    
+    ceil=True avrundar uppåt till hel sekund (fönsterstart), annars nedåt (fönsterslut).
+    """
+    if ceil and dt.microsecond:
+        dt += timedelta(seconds=1)
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _log_first_forecasts(time_series):
+    """Logga parametrarna för de givna prognoserna som ett DEBUG-meddelande"""
+    rows = ["\n📊 ANALYS AV FÖRSTA 5 PROGNOSERNA:", "-" * 40]
+    for i, forecast in enumerate(iter_forecasts(time_series)):
+        rows.append(f"\n{i+1}. {forecast.raw['validTime']}")
+        
+        # Visa relevanta parametrar
+        weather_symbol = 'N/A' if forecast.wsymb is None else forecast.wsymb
+        precipitation = 'N/A' if forecast.pmin is None else forecast.pmin  # mm/h
+        precip_type = 'N/A' if forecast.pcat is None else forecast.pcat
+        temperature = 'N/A' if forecast.temp is None else forecast.temp
+        
+        rows.append(f"   Weather symbol: {weather_symbol}")
+        rows.append(f"   Precipitation: {precipitation} mm/h")
+        rows.append(f"   Precip type: {precip_type}")
+        rows.append(f"   Temperature: {temperature}°C")
+        
+        # Visa vad weather_symbol betyder
+        if isinstance(weather_symbol, (int, float)):
+            symbol_desc = get_weather_description(int(weather_symbol))
+            rows.append(f"   Symbol meaning: {symbol_desc}")
+    
+    # Hela tabellen som ett loggmeddelande (en write istället för en per rad)
+    logger.debug("\n".join(rows))
+
+def debug_forecast_extraction(client=None, smhi_forecast_data=None):
+    """
+    Detaljerad analys av SMHI forecast data
+    
+    Args:
+        client: Befintlig WeatherClient (skapas från config.json om None)
+        smhi_forecast_data: Redan hämtad forecast (hämtas via cachen om None)
+    """
     
     print("🔍 DEBUGGING FORECAST DATA EXTRACTION")
     print("=" * 50)
     
-    # Ladda config
-    with open('config.json', 'r', encoding='utf-8') as f:
-        config = json.load(f)
-    
-    # Skapa client
-    client = WeatherClient(config)
+    if client is None:
+        # Ladda config och skapa client
+        client = WeatherClient(load_json_file('config.json'))
     
-    print("\n📡 HÄMTAR FULL SMHI FORECAST DATA...")
-    smhi_forecast_data = client.get_smhi_forecast_data()
+    if smhi_forecast_data is None:
+        print("\n📡 HÄMTAR FULL SMHI FORECAST DATA...")
+        smhi_forecast_data = cached_smhi_forecast(client)
     
     if not smhi_forecast_data or 'timeSeries' not in smhi_forecast_data:
         print("❌ Ingen SMHI forecast data!")
@@ -33,37 +78,11 @@ def debug_forecast_extraction():
     
     print(f"✅ SMHI forecast data hämtad: {len(smhi_forecast_data['timeSeries'])} tidpunkter")
     
-    # Analysera de första 5 prognoserna
-    print("\n📊 ANALYS AV FÖRSTA 5 PROGNOSERNA:")
-    print("-" * 40)
-    
-    for i, forecast in enumerate(smhi_forecast_data['timeSeries'][:5]):
-        valid_time = forecast.get('validTime', 'N/A')
-        print(f"\n{i+1}. {valid_time}")
-        
-        # Extrahera parametrar
-        params = {}
-        for param in forecast.get('parameters', []):
-            name = param.get('name')
-            values = param.get('values', [])
-            if values:
-                params[name] = values[0]
-        
-        # Visa relevanta parametrar
-        weather_symbol = params.get('Wsymb2', 'N/A')
-        precipitation = params.get('pmin', 'N/A')  # mm/h
-        precip_type = params.get('pcat', 'N/A')
-        temperature = params.get('t', 'N/A')
-        
-        print(f"   Weather symbol: {weather_symbol}")
-        print(f"   Precipitation: {precipitation} mm/h")
-        print(f"   Precip type: {precip_type}")
-        print(f"   Temperature: {temperature}°C")
-        
-        # Visa vad weather_symbol betyder
-        if isinstance(weather_symbol, (int, float)):
-            symbol_desc = get_weather_description(int(weather_symbol))
-            print(f"   Symbol meaning: {symbol_desc}")
+    # Analysera de första 5 prognoserna (bara med --verbose)
+    if logger.isEnabledFor(logging.DEBUG):
+        _log_first_forecasts(islice(smhi_forecast_data['timeSeries'], 5))
+    else:
+        print("\n📊 Kör med --verbose för analys av de första 5 prognoserna")
     
     # Analysera cykel-väder specifikt
     print("\n🚴‍♂️ CYKEL-VÄDER ANALYS:")
@@ -76,46 +95,50 @@ def debug_forecast_extraction():
     
     # Leta efter nästa timmes data specifikt
     print("\n⏰ KOMMANDE TIMMEN SPECIFIKT:")
-    from datetime import datetime, timezone, timedelta
-    now = datetime.now(timezone.utc)
-    next_hour = now + timedelta(hours=1)
+    ctx = make_time_ctx(hours=1)
+    
+    # timeSeries är sorterad och validTime är ISO-8601 UTC ('...Z') - strängjämförelse
+    # räcker för fönstret, så bara prognoserna inom timmen behöver parsas
+    time_series = smhi_forecast_data['timeSeries']
+    valid_times = [forecast['validTime'] for forecast in time_series]
+    start = bisect_left(valid_times, _smhi_time_key(ctx.now))
+    end = bisect_right(valid_times, _smhi_time_key(ctx.end, ceil=False))
     
-    next_hour_forecasts = []
-    for forecast in smhi_forecast_data['timeSeries']:
-        forecast_time = datetime.fromisoformat(forecast['validTime'].replace('Z', '+00:00'))
-        if now <= forecast_time <= next_hour:
-            next_hour_forecasts.append((forecast_time, forecast))
+    next_hour_forecasts = list(iter_forecasts(islice(time_series, start, end)))
     
     print(f"Found {len(next_hour_forecasts)} forecasts for next hour")
     
-    for forecast_time, forecast in next_hour_forecasts:
-        params = {}
-        for param in forecast.get('parameters', []):
-            name = param.get('name')
-            values = param.get('values', [])
-            if values:
-                params[name] = values[0]
+    for forecast in next_hour_forecasts:
+        precipitation = forecast.pmin if forecast.pmin is not None else 0
+        weather_symbol = forecast.wsymb if forecast.wsymb is not None else 0
         
-        precipitation = params.get('pmin', 0)
-        weather_symbol = params.get('Wsymb2', 0)
-        
-        print(f"  {forecast_time.strftime('%H:%M')}: Symbol {weather_symbol}, Precipitation {precipitation}mm/h")
+        print(f"  {forecast.t.hour:02d}:{forecast.t.minute:02d}: Symbol {weather_symbol}, Precipitation {precipitation}mm/h")
+
+# SMHI Wsymb2 1-27 → beskrivning (index 0 oanvänt)
+_WSYMB2 = (
+    None,
+    "Klart", "Mest klart", "Växlande molnighet",
+    "Halvklart", "Molnigt", "Mulet",
+    "Dimma", "Lätta regnskurar", "Måttliga regnskurar",
+    "Kraftiga regnskurar", "Åskväder", "Lätt snöblandad regn",
+    "Måttlig snöblandad regn", "Kraftig snöblandad regn",
+    "Lätta snöbyar", "Måttliga snöbyar", "Kraftiga snöbyar",
+    "Lätt regn", "Måttligt regn", "Kraftigt regn",
+    "Åska", "Lätt snöblandad regn", "Måttlig snöblandad regn",
+    "Kraftig snöblandad regn", "Lätt snöfall", "Måttligt snöfall",
+    "Kraftigt snöfall",
+)
 
 def get_weather_description(symbol: int) -> str:
     """Konvertera SMHI vädersymbol till beskrivning"""
-    descriptions = {
-        1: "Klart", 2: "Mest klart", 3: "Växlande molnighet",
-        4: "Halvklart", 5: "Molnigt", 6: "Mulet",
-        7: "Dimma", 8: "Lätta regnskurar", 9: "Måttliga regnskurar",
-        10: "Kraftiga regnskurar", 11: "Åskväder", 12: "Lätt snöblandad regn",
-        13: "Måttlig snöblandad regn", 14: "Kraftig snöblandad regn",
-        15: "Lätta snöbyar", 16: "Måttliga snöbyar", 17: "Kraftiga snöbyar",
-        18: "Lätt regn", 19: "Måttligt regn", 20: "Kraftigt regn",
-        21: "Åska", 22: "Lätt snöblandad regn", 23: "Måttlig snöblandad regn",
-        24: "Kraftig snöblandad regn", 25: "Lätt snöfall", 26: "Måttligt snöfall",
-        27: "Kraftigt snöfall"
-    }
-    return descriptions.get(symbol, "Okänt väder")
+    return _WSYMB2[symbol] if 1 <= symbol <= 27 else "Okänt väder"
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Debug av SMHI forecast data extraction')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Visa tabell per prognos')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(message)s', stream=sys.stdout)
     debug_forecast_extraction()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Debug script som kör båda SMHI-analyserna i en process
+En WeatherClient (en HTTP-session) och en hämtning av forecast delas av
+debug_forecast_extraction och debug_time_filtering
+"""
+
+import sys
+import logging
+import argparse
+
+from modules.weather_client import WeatherClient
+from modules.smhi_iter import load_json_file, cached_smhi_forecast
+from debug_forecast_extraction import debug_forecast_extraction
+from debug_time_filtering import debug_time_filtering
+
+def debug_all():
+    """Kör båda debug-analyserna med gemensam client och forecast data"""
+    
+    # Ladda config och skapa client (en gång för båda analyserna)
+    client = WeatherClient(load_json_file('config.json'))
+    
+    print("📡 HÄMTAR SMHI FORECAST DATA (delas av båda analyserna)...")
+    smhi_forecast_data = cached_smhi_forecast(client)
+    
+    debug_forecast_extraction(client, smhi_forecast_data)
+    print()
+    debug_time_filtering(client, smhi_forecast_data)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Debug av SMHI forecast extraction + tids-filtrering')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Visa tabell per prognos')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(message)s', stream=sys.stdout)
+    debug_all()
@@ -5,37 +5,61 @@ Förklarar varför "19:00" fortfarande visas kl 19:26
 """
 
 import sys
-import os
-import json
-from datetime import datetime, timezone, timedelta
-sys.path.append('modules')
+import logging
+import argparse
+from itertools import islice
+from datetime import datetime
 
-from weather_client import WeatherClient
+from modules.weather_client import WeatherClient
+from modules.smhi_iter import iter_forecasts, load_json_file, cached_smhi_forecast, make_time_ctx
 
-def debug_time_filtering():
-    """Detaljerad analys av tids-filtrering i cykel-väder"""
+# Per-prognos-tabeller loggas på DEBUG (--verbose); annars byggs de inte alls
+logger = logging.getLogger('smhi_debug')
+
+def _window_flags(timestamps, precipitations, start_ts, end_ts, threshold=0.2):
+    """
+    Klassificera prognoser mot tidsfönster och tröskel
+    
+    Tider jämförs som POSIX-timestamps (float), så ingen naiv/aware-blandning kan uppstå.
+    
+    Returns:
+        Tuple med listor (is_future, is_in_window, over_threshold)
+    """
+    is_future = [start_ts <= ts for ts in timestamps]
+    is_in_window = [future and ts <= end_ts for future, ts in zip(is_future, timestamps)]
+    return is_future, is_in_window, [p >= threshold for p in precipitations]
+
+def debug_time_filtering(client=None, smhi_forecast_data=None):
+    """
+    Detaljerad analys av tids-filtrering i cykel-väder
+    
+    Args:
+        client: Befintlig WeatherClient (skapas från config.json om None)
+        smhi_forecast_data: Redan hämtad forecast (hämtas via cachen om None)
+    """
     
     print("🕐 DEBUGGING TIDS-FILTRERING I CYKEL-VÄDER")
     print("=" * 50)
     
     # Visa aktuell tid
     now_local = datetime.now()
-    now_utc = datetime.now(timezone.utc)
+    
+    # Kommande 2 timmar (samma som i analyze_cycling_weather) - tider/strängar beräknas en gång
+    ctx = make_time_ctx(hours=2)
+    now_utc = ctx.now
     
     print(f"\n⏰ AKTUELL TID:")
     print(f"   Lokal tid: {now_local.strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"   UTC tid: {now_utc.strftime('%Y-%m-%d %H:%M:%S')} UTC")
     print(f"   Timezone: {now_local.astimezone().tzinfo}")
     
-    # Ladda config
-    with open('config.json', 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    if client is None:
+        # Ladda config och skapa client
+        client = WeatherClient(load_json_file('config.json'))
     
-    # Skapa client
-    client = WeatherClient(config)
-    
-    print(f"\n📡 HÄMTAR SMHI FORECAST DATA...")
-    smhi_forecast_data = client.get_smhi_forecast_data()
+    if smhi_forecast_data is None:
+        print(f"\n📡 HÄMTAR SMHI FORECAST DATA...")
+        smhi_forecast_data = cached_smhi_forecast(client)
     
     if not smhi_forecast_data or 'timeSeries' not in smhi_forecast_data:
         print("❌ Ingen SMHI forecast data!")
@@ -47,79 +71,62 @@ def debug_time_filtering():
     print(f"\n🔍 ANALYSERAR TIDS-FILTRERING (samma logik som analyze_cycling_weather):")
     print("-" * 60)
     
-    # Kommande 2 timmar (samma som i funktionen)
-    future_window_end = now_utc + timedelta(hours=2)
     print(f"Analyserar prognoser mellan:")
-    print(f"   Start: {now_utc.strftime('%H:%M')} UTC")
-    print(f"   Slut:  {future_window_end.strftime('%H:%M')} UTC")
+    print(f"   Start: {ctx.now_str} UTC")
+    print(f"   Slut:  {ctx.end_str} UTC")
     
     next_hours_forecasts = []
-    all_forecasts_debug = []
     
-    for i, forecast in enumerate(smhi_forecast_data['timeSeries'][:10]):  # Bara första 10 för debug
-        try:
-            forecast_time = datetime.fromisoformat(forecast['validTime'].replace('Z', '+00:00'))
-            
-            # Extrahera precipitation
-            precipitation = 0.0
-            for param in forecast.get('parameters', []):
-                if param.get('name') == 'pmin' and param.get('values'):
-                    precipitation = float(param['values'][0])
-                    break
-            
-            # Debug info
-            time_str = forecast_time.strftime('%H:%M')
-            is_future = now_utc <= forecast_time
-            is_in_window = now_utc <= forecast_time <= future_window_end
-            over_threshold = precipitation >= 0.2
+    # Prognoserna som Forecast-tupler (tid + parametrar parsade en gång), klassificera sedan alla på en gång
+    forecasts = list(iter_forecasts(islice(smhi_forecast_data['timeSeries'], 10)))  # Bara första 10 för debug
+    precipitations = [float(forecast.pmin or 0.0) for forecast in forecasts]
+    
+    # Fönstret jämförs som timestamps: en konvertering per prognos, sedan float-jämförelser
+    is_future, is_in_window, over_threshold = _window_flags(
+        [forecast.t.timestamp() for forecast in forecasts],
+        precipitations,
+        ctx.now_ts, ctx.end_ts
+    )
+    
+    # Samma condition som i analyze_cycling_weather (ctx.now <= forecast_time <= ctx.end)
+    for forecast, precipitation, in_window in zip(forecasts, precipitations, is_in_window):
+        if in_window:
+            next_hours_forecasts.append((forecast.t, forecast.raw, precipitation))
+    
+    # Visa alla prognoser med debug-info (bara med --verbose) - raderna byggs direkt ur flaggorna
+    if logger.isEnabledFor(logging.DEBUG):
+        rows = [
+            f"\n📋 ALLA PROGNOSER (första 10):",
+            "Tid   | Nederbörd | Framtid? | I fönster? | >Tröskel? | Inkluderas?",
+            "-" * 65
+        ]
+        for forecast, precipitation, future, in_window, over in zip(forecasts, precipitations, is_future, is_in_window, over_threshold):
+            future_mark = "✅" if future else "❌"
+            window_mark = "✅" if in_window else "❌"  
+            threshold_mark = "✅" if over else "❌"
+            include_mark = "⚠️ YES" if in_window and over else "❌"
             
-            debug_info = {
-                'index': i,
-                'time': time_str,
-                'time_full': forecast_time,
-                'precipitation': precipitation,
-                'is_future': is_future,
-                'is_in_window': is_in_window, 
-                'over_threshold': over_threshold,
-                'would_include': is_in_window and over_threshold
-            }
-            all_forecasts_debug.append(debug_info)
-            
-            # Samma condition som i analyze_cycling_weather
-            if now_utc <= forecast_time <= future_window_end:
-                next_hours_forecasts.append((forecast_time, forecast, precipitation))
-                
-        except Exception as e:
-            print(f"⚠️ Fel vid parsning av forecast {i}: {e}")
-            continue
-    
-    # Visa alla prognoser med debug-info
-    print(f"\n📋 ALLA PROGNOSER (första 10):")
-    print("Tid   | Nederbörd | Framtid? | I fönster? | >Tröskel? | Inkluderas?")
-    print("-" * 65)
-    
-    for debug in all_forecasts_debug:
-        future_mark = "✅" if debug['is_future'] else "❌"
-        window_mark = "✅" if debug['is_in_window'] else "❌"  
-        threshold_mark = "✅" if debug['over_threshold'] else "❌"
-        include_mark = "⚠️ YES" if debug['would_include'] else "❌"
+            rows.append(f"{forecast.t.hour:02d}:{forecast.t.minute:02d} | {precipitation:8.1f} | {future_mark:8} | {window_mark:10} | {threshold_mark:9} | {include_mark}")
         
-        print(f"{debug['time']} | {debug['precipitation']:8.1f} | {future_mark:8} | {window_mark:10} | {threshold_mark:9} | {include_mark}")
+        # Hela tabellen som ett loggmeddelande (en write istället för en per rad)
+        logger.debug("\n".join(rows))
+    else:
+        print("\n📋 Kör med --verbose för tabell över alla prognoser (första 10)")
     
     # Analysera resulterad lista (samma som funktionen använder)
     print(f"\n🎯 PROGNOSER SOM INKLUDERAS I ANALYS:")
     if next_hours_forecasts:
         print(f"Hittade {len(next_hours_forecasts)} prognoser i 2h-fönstret:")
         
-        max_precipitation = 0.0
-        warning_forecast_time = None
-        
         for forecast_time, forecast, precipitation in next_hours_forecasts:
-            print(f"   {forecast_time.strftime('%H:%M')}: {precipitation}mm/h")
-            
-            if precipitation >= 0.2 and precipitation > max_precipitation:
-                max_precipitation = precipitation
-                warning_forecast_time = forecast_time
+            print(f"   {forecast_time.hour:02d}:{forecast_time.minute:02d}: {precipitation}mm/h")
+        
+        # Första prognosen med högst nederbörd över tröskeln (max() behåller första vid lika)
+        warning_forecast_time, max_precipitation = max(
+            ((forecast_time, precipitation) for forecast_time, _, precipitation in next_hours_forecasts
+             if precipitation >= 0.2),
+            key=lambda item: item[1], default=(None, 0.0)
+        )
         
         if warning_forecast_time:
             selected_time = warning_forecast_time.strftime('%H:%M')
@@ -144,4 +151,11 @@ def debug_time_filtering():
     print("3. Timezone-förvirring mellan lokal tid och UTC")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Debug av tids-filtrering i cykel-väder')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Visa tabell per prognos')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(message)s', stream=sys.stdout)
     debug_time_filtering()
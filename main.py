@@ -17,7 +17,7 @@ import json
 import time
 import math
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 from PIL import Image, ImageDraw, ImageFont
 import logging
 
@@ -28,13 +28,13 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'e-Paper', 'RaspberryPi_
 sys.path.append('modules')
 from weather_client import WeatherClient
 from icon_manager import WeatherIconManager
+from display_spec import COMPARE_SPEC, extract_compare_values, compare_digest, draw_border
 
-try:
-    from waveshare_epd import epd4in26
-except ImportError as e:
-    print(f"❌ Kan inte importera Waveshare bibliotek: {e}")
-    print("🔧 Kontrollera att E-Paper biblioteket är installerat korrekt")
-    sys.exit(1)
+# Svenska veckodagar indexerade med date.weekday() och månader med date.month
+SWEDISH_WEEKDAYS = ('Måndag', 'Tisdag', 'Onsdag', 'Torsdag', 'Fredag', 'Lördag', 'Söndag')
+SWEDISH_WEEKDAYS_SHORT = ('Mån', 'Tis', 'Ons', 'Tor', 'Fre', 'Lör', 'Sön')
+SWEDISH_MONTHS = (None, 'Januari', 'Februari', 'Mars', 'April', 'Maj', 'Juni',
+                  'Juli', 'Augusti', 'September', 'Oktober', 'November', 'December')
 
 class EPaperWeatherApp:
     """Huvudklass för E-Paper väderapp med Netatmo + SMHI + Weather Icons + exakta soltider"""
@@ -61,9 +61,8 @@ class EPaperWeatherApp:
         # Initialisera ikon-hanterare
         self.icon_manager = WeatherIconManager(icon_base_path="icons/")
         
-        # Initialisera E-Paper display
+        # E-Paper display initialiseras först när en frame ska visas (display_canvas)
         self.epd = None
-        self.init_display()
         
         # Skapa canvas för rendering
         self.width = self.config['layout']['screen_width']
@@ -74,6 +73,31 @@ class EPaperWeatherApp:
         # Ladda typsnitt
         self.fonts = self.load_fonts()
         
+        # Renderare per modul - render_weather_layout slår upp istället för if/elif-kedja
+        self._module_renderers = {
+            'main_weather': self.render_main_weather,
+            'barometer_module': self.render_barometer,
+            'tomorrow_forecast': self.render_tomorrow_forecast,
+            'clock_module': self.render_clock,
+            'status_module': self.render_status
+        }
+        
+        # Status-prick (fylld 3px ellips) rastreras en gång och pastas som mask
+        self._dot_mask = Image.new('1', (4, 4), 0)
+        ImageDraw.Draw(self._dot_mask).ellipse([(0, 0), (3, 3)], fill=255)
+        
+        # Modulgeometri löses upp en gång - config och panelstorlek ändras inte under körningen
+        # Moduler utan renderare här (t.ex. precipitation_module, som daemon aktiverar via
+        # triggers) hoppas över helt - varken ram eller innehåll
+        self._module_geom = [
+            (module_name,
+             module_config['coords']['x'], module_config['coords']['y'],
+             module_config['size']['width'], module_config['size']['height'],
+             self._module_renderers[module_name])
+            for module_name, module_config in self.config['modules'].items()
+            if module_config['enabled'] and module_name in self._module_renderers
+        ]
+        
         print("✅ E-Paper Väderapp med Netatmo + exakta soltider + SMART UPPDATERING initialiserad!")
     
     def ensure_cache_directory(self):
@@ -105,48 +129,49 @@ class EPaperWeatherApp:
             self.logger.error(f"❌ Fel vid läsning av cache: {e}")
             return {}
     
-    def save_current_values(self, weather_data: Dict):
+    def save_current_values(self, weather_data: Dict, now: Optional[datetime] = None):
         """
         Spara aktuella värden för nästa jämförelse
         
         Args:
             weather_data: Komplett väderdata att cacha
+            now: Körningens tidsstämpel (datetime.now() om den inte anges)
         """
         try:
-            # Extrahera ENDAST viktiga värden för jämförelse
-            current_values = {
-                'temperature': weather_data.get('temperature'),
-                'weather_symbol': weather_data.get('weather_symbol'),
-                'weather_description': weather_data.get('weather_description'),
-                'pressure': weather_data.get('pressure'),
-                'pressure_trend_text': weather_data.get('pressure_trend_text'),
-                'pressure_trend_arrow': weather_data.get('pressure_trend_arrow'),
-                'tomorrow_temp': weather_data.get('tomorrow', {}).get('temperature'),
-                'tomorrow_symbol': weather_data.get('tomorrow', {}).get('weather_symbol'),
-                'tomorrow_desc': weather_data.get('tomorrow', {}).get('weather_description'),
-                'sunrise': weather_data.get('sun_data', {}).get('sunrise'),
-                'sunset': weather_data.get('sun_data', {}).get('sunset'),
-                'date': datetime.now().strftime('%Y-%m-%d'),  # Datum för midnatt-kontroll
-                'last_display_update': time.time(),  # Timestamp för watchdog
-                'cached_at': datetime.now().isoformat()
-            }
-            
-            # Spara till cache-fil
-            with open(self.last_values_file, 'w', encoding='utf-8') as f:
-                json.dump(current_values, f, indent=2, ensure_ascii=False)
+            now = now or datetime.now()
+            
+            # Extrahera ENDAST viktiga värden för jämförelse (numeriska fält sparas som float)
+            current_values = extract_compare_values(weather_data)
+            for key, _, scale, _ in COMPARE_SPEC:
+                if scale is not None and current_values[key] is not None:
+                    current_values[key] = float(current_values[key])
+            
+            # Digest över de kvantiserade fälten - nästa körning jämför bara den om inget ändrats
+            current_values['digest'] = compare_digest(current_values)
+            current_values['date'] = now.strftime('%Y-%m-%d')  # Datum för midnatt-kontroll
+            current_values['last_display_update'] = time.time()  # Timestamp för watchdog
+            current_values['cached_at'] = now.isoformat()
+            
+            # Spara till cache-fil: kompakt JSON till temp-fil + atomiskt byte, så ett
+            # strömavbrott mitt i skrivningen inte lämnar en halv cache-fil
+            tmp_file = self.last_values_file + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(current_values, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.last_values_file)
             
             self.logger.debug(f"💾 Sparade aktuella värden till cache")
             
         except Exception as e:
             self.logger.error(f"❌ Fel vid sparande av cache: {e}")
     
-    def should_update_display(self, weather_data: Dict, last_values: Dict) -> tuple:
+    def should_update_display(self, weather_data: Dict, last_values: Dict, now: Optional[datetime] = None) -> tuple:
         """
         Avgör om displayen behöver uppdateras baserat på dataförändringar
         
         Args:
             weather_data: Nya väderdata
             last_values: Senaste cachade värden
+            now: Körningens tidsstämpel (datetime.now() om den inte anges)
             
         Returns:
             Tuple (should_update: bool, reason: str)
@@ -163,40 +188,31 @@ class EPaperWeatherApp:
                 return True, f"30-min watchdog ({time_since_last_update/60:.1f} min sedan)"
             
             # DATUM-KONTROLL: Uppdatera vid midnatt (nytt datum)
-            current_date = datetime.now().strftime('%Y-%m-%d')
+            current_date = (now or datetime.now()).strftime('%Y-%m-%d')
             last_date = last_values.get('date')
             
             if current_date != last_date:
                 return True, f"Nytt datum: {last_date} → {current_date}"
             
-            # JÄMFÖR VIKTIGA VÄDERDATA
-            comparisons = [
-                ('temperature', weather_data.get('temperature'), 'Temperatur'),
-                ('weather_symbol', weather_data.get('weather_symbol'), 'Väderikon'),
-                ('weather_description', weather_data.get('weather_description'), 'Väderbeskrivning'),
-                ('pressure', weather_data.get('pressure'), 'Lufttryck'),
-                ('pressure_trend_text', weather_data.get('pressure_trend_text'), 'Trycktrend text'),
-                ('pressure_trend_arrow', weather_data.get('pressure_trend_arrow'), 'Trycktrend pil'),
-                ('tomorrow_temp', weather_data.get('tomorrow', {}).get('temperature'), 'Imorgon temperatur'),
-                ('tomorrow_symbol', weather_data.get('tomorrow', {}).get('weather_symbol'), 'Imorgon väderikon'),
-                ('tomorrow_desc', weather_data.get('tomorrow', {}).get('weather_description'), 'Imorgon beskrivning'),
-                ('sunrise', weather_data.get('sun_data', {}).get('sunrise'), 'Soluppgång'),
-                ('sunset', weather_data.get('sun_data', {}).get('sunset'), 'Solnedgång'),
-            ]
-            
-            for key, current_value, description in comparisons:
-                last_value = last_values.get(key)
-                
-                # Speciell hantering för numeriska värden (temperaturer, tryck)
-                if key in ['temperature', 'pressure', 'tomorrow_temp']:
-                    if current_value is not None and last_value is not None:
-                        # Jämför med 0.1 tolerans för att undvika uppdatering vid små avrundningsfel
-                        if abs(float(current_value) - float(last_value)) >= 0.1:
+            # JÄMFÖR VIKTIGA VÄDERDATA: lika digest (sparad i save_current_values) betyder inga
+            # ändringar - fältloopen körs bara vid skillnad, för att ta fram anledningen
+            current_values = extract_compare_values(weather_data)
+            if compare_digest(current_values) != last_values.get('digest'):
+                for key, _, scale, description in COMPARE_SPEC:
+                    current_value = current_values[key]
+                    last_value = last_values.get(key)
+                    
+                    # Speciell hantering för numeriska värden (temperaturer, tryck)
+                    if scale is not None:
+                        if current_value is not None and last_value is not None:
+                            # 0.1-steg räknas som ändring även när float-differensen blir 0.0999...
+                            # (last_value sparas redan som float i save_current_values)
+                            if not math.isclose(float(current_value), last_value, abs_tol=0.09):
+                                return True, f"{description}: {last_value} → {current_value}"
+                    else:
+                        # Exakt jämförelse för strängar och heltal
+                        if current_value != last_value:
                             return True, f"{description}: {last_value} → {current_value}"
-                else:
-                    # Exakt jämförelse för strängar och heltal
-                    if current_value != last_value:
-                        return True, f"{description}: {last_value} → {current_value}"
             
             # INGEN FÖRÄNDRING DETEKTERAD
             self.logger.info(f"🔍 Ingen betydande förändring detekterad - behåller E-Paper skärm")
@@ -279,18 +295,50 @@ class EPaperWeatherApp:
         self.logger.info("🔧 Logging konfigurerat")
     
     def init_display(self):
-        """Initialisera E-Paper display"""
+        """
+        Initialisera E-Paper display (lazy - anropas från display_canvas vid första uppdateringen)
+        
+        Clear() körs bara första gången efter reboot (se clear_on_first_boot) - annars är
+        display() av en hel frame själv en full refresh.
+        """
         try:
             self.logger.info("📱 Initialiserar E-Paper display...")
+            
+            # Waveshare-biblioteket importeras först här - körningar utan skärmuppdatering
+            # rör varken drivrutinen eller SPI
+            try:
+                from waveshare_epd import epd4in26
+            except ImportError as e:
+                print(f"❌ Kan inte importera Waveshare bibliotek: {e}")
+                print("🔧 Kontrollera att E-Paper biblioteket är installerat korrekt")
+                raise
+            
             self.epd = epd4in26.EPD()
             self.epd.init()
-            self.epd.Clear()
+            self.clear_on_first_boot()
             self.logger.info("✅ E-Paper display redo")
         except Exception as e:
             self.logger.error(f"❌ E-Paper display-fel: {e}")
             if not self.config['debug']['test_mode']:
                 sys.exit(1)
     
+    def clear_on_first_boot(self):
+        """
+        Rensa panelen (full Clear) en gång per boot
+        
+        Marker-filen ligger i /tmp och försvinner vid reboot, så första skärmuppdateringen
+        efter start rensar eventuella spökbilder. Delas med daemon - bara en av dem rensar.
+        """
+        marker_file = "/tmp/epaper_panel_cleared"
+        if os.path.exists(marker_file):
+            return
+        
+        self.logger.info("🧹 Första start efter reboot - rensar E-Paper display")
+        self.epd.Clear()
+        
+        with open(marker_file, 'w') as f:
+            f.write(f"Panel cleared at {datetime.now().strftime('%Y%m%d_%H%M%S')}\n")
+    
     def load_fonts(self):
         """Ladda typsnitt för olika moduler"""
         fonts = {}
@@ -310,71 +358,12 @@ class EPaperWeatherApp:
         return fonts
     
     def clear_canvas(self):
-        """Rensa canvas (vit bakgrund)"""
-        self.draw.rectangle([(0, 0), (self.width, self.height)], fill=255)
+        """Rensa canvas (vit bakgrund) - fyller bufferten direkt istället för att rita en rektangel"""
+        self.canvas.paste(255, (0, 0, self.width, self.height))
     
     def draw_module_border(self, x, y, width, height, module_name):
-        """Rita smarta modulramar som inte dubbleras"""
-        # Bara rita vissa sidor för att undvika dubblering
-        if module_name == 'main_weather':
-            # HERO: Rita alla sidor
-            self.draw.rectangle([(x, y), (x + width, y + height)], outline=0, width=2)
-            self.draw.rectangle([(x + 2, y + 2), (x + width - 2, y + height - 2)], outline=0, width=1)
-            # Dekorativ linje
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        
-        elif module_name == 'barometer_module':
-            # MEDIUM 1: Rita alla sidor
-            self.draw.rectangle([(x, y), (x + width, y + height)], outline=0, width=2)
-            self.draw.rectangle([(x + 2, y + 2), (x + width - 2, y + height - 2)], outline=0, width=1)
-            # Dekorativ linje
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        
-        elif module_name == 'tomorrow_forecast':
-            # MEDIUM 2: Rita alla sidor
-            self.draw.rectangle([(x, y), (x + width, y + height)], outline=0, width=2)
-            self.draw.rectangle([(x + 2, y + 2), (x + width - 2, y + height - 2)], outline=0, width=1)
-            # Dekorativ linje
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        
-        elif module_name == 'clock_module':
-            # SMALL 1: Rita alla sidor utom höger (för att undvika dubblering med status_module)
-            # Topp, vänster, botten
-            self.draw.line([(x, y), (x + width, y)], fill=0, width=2)  # Topp
-            self.draw.line([(x, y), (x, y + height)], fill=0, width=2)  # Vänster
-            self.draw.line([(x, y + height), (x + width, y + height)], fill=0, width=2)  # Botten
-            # Höger sida - tunnare för att inte konflikta
-            self.draw.line([(x + width, y), (x + width, y + height)], fill=0, width=1)  # Höger (tunn)
-            
-            # Inre ram
-            self.draw.line([(x + 2, y + 2), (x + width - 2, y + 2)], fill=0, width=1)  # Topp
-            self.draw.line([(x + 2, y + 2), (x + 2, y + height - 2)], fill=0, width=1)  # Vänster
-            self.draw.line([(x + 2, y + height - 2), (x + width - 2, y + height - 2)], fill=0, width=1)  # Botten
-            
-            # Dekorativ linje
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        
-        elif module_name == 'status_module':
-            # SMALL 2: Rita alla sidor utom vänster (för att undvika dubblering med clock_module)
-            # Topp, höger, botten
-            self.draw.line([(x, y), (x + width, y)], fill=0, width=2)  # Topp
-            self.draw.line([(x + width, y), (x + width, y + height)], fill=0, width=2)  # Höger
-            self.draw.line([(x, y + height), (x + width, y + height)], fill=0, width=2)  # Botten
-            # Vänster sida - tunnare för att inte konflikta
-            self.draw.line([(x, y), (x, y + height)], fill=0, width=1)  # Vänster (tunn)
-            
-            # Inre ram
-            self.draw.line([(x + 2, y + 2), (x + width - 2, y + 2)], fill=0, width=1)  # Topp
-            self.draw.line([(x + width - 2, y + 2), (x + width - 2, y + height - 2)], fill=0, width=1)  # Höger
-            self.draw.line([(x + 2, y + height - 2), (x + width - 2, y + height - 2)], fill=0, width=1)  # Botten
-            
-            # Dekorativ linje
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
+        """Rita smarta modulramar som inte dubbleras (BORDER_SPEC, delad med daemon)"""
+        draw_border(self.draw, x, y, width, height, module_name)
     
     def get_swedish_date(self, date_obj):
         """
@@ -386,24 +375,7 @@ class EPaperWeatherApp:
         Returns:
             Formaterad svensk datumsträng
         """
-        swedish_days = {
-            'Monday': 'Måndag', 'Tuesday': 'Tisdag', 'Wednesday': 'Onsdag', 
-            'Thursday': 'Torsdag', 'Friday': 'Fredag', 'Saturday': 'Lördag', 'Sunday': 'Söndag'
-        }
-        
-        swedish_months = {
-            1: 'Januari', 2: 'Februari', 3: 'Mars', 4: 'April', 5: 'Maj', 6: 'Juni',
-            7: 'Juli', 8: 'Augusti', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'December'
-        }
-        
-        english_day = date_obj.strftime('%A')
-        swedish_day = swedish_days.get(english_day, english_day)
-        
-        day_num = date_obj.day
-        month_num = date_obj.month
-        swedish_month = swedish_months.get(month_num, str(month_num))
-        
-        return swedish_day, f"{day_num} {swedish_month}"
+        return SWEDISH_WEEKDAYS[date_obj.weekday()], f"{date_obj.day} {SWEDISH_MONTHS[date_obj.month]}"
     
     def get_swedish_date_short(self, date_obj):
         """
@@ -415,18 +387,7 @@ class EPaperWeatherApp:
         Returns:
             Kort formaterad svensk datumsträng
         """
-        swedish_days_short = {
-            'Monday': 'Mån', 'Tuesday': 'Tis', 'Wednesday': 'Ons', 
-            'Thursday': 'Tor', 'Friday': 'Fre', 'Saturday': 'Lör', 'Sunday': 'Sön'
-        }
-        
-        english_day = date_obj.strftime('%A')
-        swedish_day = swedish_days_short.get(english_day, english_day[:3])
-        
-        day_num = date_obj.day
-        month_num = date_obj.month
-        
-        return f"{swedish_day} {day_num}/{month_num}"
+        return f"{SWEDISH_WEEKDAYS_SHORT[date_obj.weekday()]} {date_obj.day}/{date_obj.month}"
     
     def truncate_text(self, text, font, max_width):
         """Korta text så den får plats inom given bredd"""
@@ -440,15 +401,22 @@ class EPaperWeatherApp:
         if text_width <= max_width:
             return text
         
-        # Förkorta ord för ord tills den får plats
+        # Längsta ordprefix som får plats (binärsökning - bredden växer med antalet ord)
         words = text.split()
-        for i in range(len(words), 0, -1):
-            truncated = ' '.join(words[:i])
+        low, high = 1, len(words)
+        best = None
+        while low <= high:
+            mid = (low + high) // 2
+            truncated = ' '.join(words[:mid])
             bbox = self.draw.textbbox((0, 0), truncated, font=font)
-            truncated_width = bbox[2] - bbox[0]
-            
-            if truncated_width <= max_width:
-                return truncated
+            if bbox[2] - bbox[0] <= max_width:
+                best = truncated
+                low = mid + 1
+            else:
+                high = mid - 1
+        
+        if best is not None:
+            return best
         
         # Som sista utväg, returnera första ordet
         return words[0] if words else text
@@ -576,13 +544,14 @@ class EPaperWeatherApp:
             self.logger.error(f"❌ Fel vid formatering av datakällor: {e}")
             return "unknown"
     
-    def render_weather_layout(self, weather_data: Dict):
+    def render_weather_layout(self, weather_data: Dict, now: Optional[datetime] = None):
         """
         NYTT: Rendera layout MED redan hämtad väderdata
         Denna metod anropas BARA när displayen ska uppdateras
         
         Args:
             weather_data: Redan hämtad väderdata
+            now: Körningens tidsstämpel (datetime.now() om den inte anges)
         """
         try:
             self.logger.info("🎨 Renderar layout för E-Paper display...")
@@ -590,244 +559,17 @@ class EPaperWeatherApp:
             # Rensa canvas BARA när vi faktiskt ska rendera
             self.clear_canvas()
             
-            # Hämta parsade soltider från weather_data
-            sunrise = weather_data.get('parsed_sunrise')
-            sunset = weather_data.get('parsed_sunset')
-            sun_data = weather_data.get('parsed_sun_data', {})
+            # Aktuell tid för dag/natt-bestämning, datum och uppdateringstid - samma för hela framen
+            current_time = now or datetime.now()
             
-            # Aktuell tid för dag/natt-bestämning
-            current_time = datetime.now()
-            
-            # Rita alla moduler enligt konfiguration
-            modules = self.config['modules']
-            
-            for module_name, module_config in modules.items():
-                if module_config['enabled']:
-                    x = module_config['coords']['x']
-                    y = module_config['coords']['y'] 
-                    width = module_config['size']['width']
-                    height = module_config['size']['height']
-                    
-                    # Rita smarta modulramar
-                    self.draw_module_border(x, y, width, height, module_name)
-                    
-                    # Rita innehåll för varje modul MED NETATMO + SMHI DATA
-                    if module_name == 'main_weather':
-                        temp = weather_data.get('temperature', 20.0)
-                        desc = weather_data.get('weather_description', 'Okänt väder')
-                        temp_source = weather_data.get('temperature_source', 'fallback')
-                        location = weather_data.get('location', 'Okänd plats')
-                        smhi_symbol = weather_data.get('weather_symbol', 1)  # SMHI väder-symbol
-                        
-                        # Plats överst i hero-modulen
-                        self.draw.text((x + 20, y + 15), location, font=self.fonts['medium_desc'], fill=0)
-                        
-                        # VÄDERIKON med exakt dag/natt-logik - VERKLIG HÖGUPPLÖST STORLEK (96x96)
-                        weather_icon = self.icon_manager.get_weather_icon_for_time(
-                            smhi_symbol, current_time, sun_data, size=(96, 96)
-                        )
-                        if weather_icon:
-                            # Placera ikon till höger om temperaturen - justerad position för 96x96
-                            icon_x = x + 320
-                            icon_y = y + 50
-                            self.paste_icon_on_canvas(weather_icon, icon_x, icon_y)
-                            self.logger.info(f"🎨 HERO väderikon: 96x96 SVG-baserad (symbol {smhi_symbol})")
-                        
-                        # TEMPERATUR (prioriterat från Netatmo!)
-                        self.draw.text((x + 20, y + 60), f"{temp:.1f}°", font=self.fonts['hero_temp'], fill=0)
-                        
-                        # Beskrivning (från SMHI meteorologi)
-                        desc_truncated = self.truncate_text(desc, self.fonts['hero_desc'], width - 40)
-                        self.draw.text((x + 20, y + 150), desc_truncated, font=self.fonts['hero_desc'], fill=0)
-                        
-                        # NYTT: Visa temperatur-källa
-                        if temp_source == 'netatmo':
-                            source_text = "(NETATMO)"
-                        elif temp_source == 'smhi':
-                            source_text = "(SMHI)"
-                        else:
-                            source_text = f"({temp_source.upper()})"
-                        
-                        self.draw.text((x + 20, y + 185), source_text, font=self.fonts['tiny'], fill=0)
-                        
-                        # EXAKTA SOL-IKONER + tider - HÖGUPPLÖST STORLEK (56x56)
-                        if sunrise and sunset:
-                            sunrise_str = sunrise.strftime('%H:%M')
-                            sunset_str = sunset.strftime('%H:%M')
-                            
-                            # Soluppgång - ikon + exakt tid
-                            sunrise_icon = self.icon_manager.get_sun_icon('sunrise', size=(56, 56))
-                            if sunrise_icon:
-                                self.paste_icon_on_canvas(sunrise_icon, x + 20, y + 200)
-                                self.draw.text((x + 80, y + 215), sunrise_str, font=self.fonts['medium_desc'], fill=0)
-                                self.logger.debug(f"🌅 Sol-ikon: 56x56 SVG-baserad")
-                            else:
-                                # Fallback utan ikon
-                                self.draw.text((x + 20, y + 215), f"🌅 {sunrise_str}", font=self.fonts['medium_desc'], fill=0)
-                            
-                            # Solnedgång - ikon + exakt tid  
-                            sunset_icon = self.icon_manager.get_sun_icon('sunset', size=(56, 56))
-                            if sunset_icon:
-                                self.paste_icon_on_canvas(sunset_icon, x + 180, y + 200)
-                                self.draw.text((x + 240, y + 215), sunset_str, font=self.fonts['medium_desc'], fill=0)
-                                self.logger.debug(f"🌇 Sol-ikon: 56x56 SVG-baserad")
-                            else:
-                                # Fallback utan ikon
-                                self.draw.text((x + 180, y + 215), f"🌇 {sunset_str}", font=self.fonts['medium_desc'], fill=0)
-                        
-                        # NYTT: Visa soldata-källa (diskret)
-                        sun_source = sun_data.get('source', 'unknown')
-                        if sun_source != 'unknown':
-                            source_text = f"Sol: {sun_source}"
-                            if sun_source == 'ipgeolocation.io':
-                                source_text = "Sol: API ✓"
-                            elif sun_source == 'fallback':
-                                source_text = "Sol: approx"
-                            self.draw.text((x + 20, y + 250), source_text, font=self.fonts['tiny'], fill=0)
-                    
-                    elif module_name == 'barometer_module':
-                        # 🚨 FIXED: Använd RIKTIGA trycktrend-data från weather_client
-                        pressure = weather_data.get('pressure', 1013)
-                        pressure_source = weather_data.get('pressure_source', 'unknown')
-                        
-                        # ANVÄND RIKTIGA TREND-DATA från weather_client.py
-                        pressure_trend = weather_data.get('pressure_trend', {})
-                        trend_text = weather_data.get('pressure_trend_text', 'Samlar data')
-                        trend_arrow = weather_data.get('pressure_trend_arrow', 'stable')
-                        
-                        # 🎯 LOGGA VAD VI FAKTISKT FÅR
-                        self.logger.info(f"🔍 BAROMETER DEBUG:")
-                        self.logger.info(f"  pressure_trend: {pressure_trend}")
-                        self.logger.info(f"  trend_text: {trend_text}")
-                        self.logger.info(f"  trend_arrow: {trend_arrow}")
-                        
-                        # Barometer-ikon - HÖGUPPLÖST STORLEK (80x80)
-                        barometer_icon = self.icon_manager.get_system_icon('barometer', size=(80, 80))
-                        if barometer_icon:
-                            self.paste_icon_on_canvas(barometer_icon, x + 15, y + 20)
-                            # Tryck-värde bredvid ikon (justerad position för större ikon)
-                            self.draw.text((x + 100, y + 40), f"{int(pressure)}", font=self.fonts['medium_main'], fill=0)
-                            self.logger.info(f"📊 Barometer-ikon: 80x80 SVG-baserad")
-                        else:
-                            # Fallback utan ikon
-                            self.draw.text((x + 20, y + 50), f"{int(pressure)}", font=self.fonts['medium_main'], fill=0)
-                        
-                        # hPa-text (FIXAD: Flyttad längre ner för att inte kollidera med siffran)
-                        self.draw.text((x + 100, y + 100), "hPa", font=self.fonts['medium_desc'], fill=0)
-                        
-                        # RIKTIGA TREND-TEXT (från 3h-analys) - RADBRYTS OM DET ÄR "Samlar data"
-                        if trend_text == 'Samlar data':
-                            self.draw.text((x + 20, y + 125), "Samlar", font=self.fonts['medium_desc'], fill=0)
-                            self.draw.text((x + 20, y + 150), "data", font=self.fonts['medium_desc'], fill=0)
-                        else:
-                            self.draw.text((x + 20, y + 125), trend_text, font=self.fonts['medium_desc'], fill=0)
-                        
-                        # BONUS: Visa numerisk 3h-förändring om tillgänglig
-                        if pressure_trend.get('change_3h') is not None and pressure_trend.get('trend') != 'insufficient_data':
-                            change_3h = pressure_trend['change_3h']
-                            change_text = f"{change_3h:+.1f} hPa/3h"
-                            # Placera under trend-text, anpassat för radbrytsning
-                            change_y = y + 175 if trend_text == 'Samlar data' else y + 150
-                            self.draw.text((x + 20, change_y), change_text, font=self.fonts['small_desc'], fill=0)
-                        
-                        # TREND-PIL från Weather Icons - OPTIMERAD STORLEK (64x64)
-                        trend_icon = self.icon_manager.get_pressure_icon(trend_arrow, size=(64, 64))
-                        if trend_icon:
-                            # Höger sida av modulen, optimerad position för 64x64
-                            trend_x = x + width - 75  # 75px från höger kant för 64px ikon
-                            trend_y = y + 100  # Centrerad vertikalt
-                            self.paste_icon_on_canvas(trend_icon, trend_x, trend_y)
-                            self.logger.info(f"↗️ Trycktrend-pil: 64x64 SVG-baserad ({trend_arrow})")
-                        
-                        # NYTT: Visa tryck-källa (diskret) - FLYTTAD FÖR ATT INTE KOLLIDERA MED PIL
-                        if pressure_source == 'netatmo':
-                            self.draw.text((x + 20, y + height - 20), "(Netatmo)", font=self.fonts['tiny'], fill=0)
-                        elif pressure_source == 'smhi':
-                            self.draw.text((x + 20, y + height - 20), "(SMHI)", font=self.fonts['tiny'], fill=0)
-                    
-                    elif module_name == 'tomorrow_forecast':
-                        tomorrow = weather_data.get('tomorrow', {})
-                        tomorrow_temp = tomorrow.get('temperature', 18.0)
-                        tomorrow_desc = tomorrow.get('weather_description', 'Okänt')
-                        tomorrow_symbol = tomorrow.get('weather_symbol', 3)
-                        
-                        # "Imorgon" titel
-                        self.draw.text((x + 20, y + 30), "Imorgon", font=self.fonts['medium_desc'], fill=0)
-                        
-                        # Imorgon väderikon - HÖGUPPLÖST STORLEK (80x80)
-                        tomorrow_icon = self.icon_manager.get_weather_icon(tomorrow_symbol, is_night=False, size=(80, 80))
-                        if tomorrow_icon:
-                            self.paste_icon_on_canvas(tomorrow_icon, x + 140, y + 20)
-                            self.logger.debug(f"🌦️ Prognos-ikon: 80x80 SVG-baserad (symbol {tomorrow_symbol})")
-                        
-                        # Temperatur (alltid från SMHI-prognos)
-                        self.draw.text((x + 20, y + 80), f"{tomorrow_temp:.1f}°", font=self.fonts['medium_main'], fill=0)
-                        
-                        # Väderbeskrivning
-                        desc_truncated = self.truncate_text(tomorrow_desc, self.fonts['small_desc'], width - 60)
-                        self.draw.text((x + 20, y + 130), desc_truncated, font=self.fonts['small_desc'], fill=0)
-                        
-                        # NYTT: Visa att det är SMHI-prognos
-                        self.draw.text((x + 20, y + 155), "(SMHI prognos)", font=self.fonts['tiny'], fill=0)
-                    
-                    elif module_name == 'clock_module':
-                        # OMVANDLAD TILL ELEGANT DATUMMODUL - INGEN KLOCKA LÄNGRE
-                        now = datetime.now()
-                        
-                        # Hämta svenska datum-komponenter
-                        swedish_weekday, swedish_date = self.get_swedish_date(now)
-                        
-                        # Kalenderdakts-ikon för modern utseende
-                        calendar_icon = self.icon_manager.get_system_icon('calendar', size=(40, 40))
-                        if calendar_icon:
-                            # Placera ikon till vänster
-                            self.paste_icon_on_canvas(calendar_icon, x + 15, y + 20)
-                            text_start_x = x + 65  # Text börjar efter ikon
-                        else:
-                            # Fallback: ingen ikon, text börjar tidigare
-                            text_start_x = x + 15
-                        
-                        # VECKODAG (stor och tydlig)
-                        weekday_truncated = self.truncate_text(swedish_weekday, self.fonts['small_main'], width - 80)
-                        self.draw.text((text_start_x, y + 20), weekday_truncated, font=self.fonts['small_main'], fill=0)
-                        
-                        # DATUM (elegant under veckodagen)
-                        date_truncated = self.truncate_text(swedish_date, self.fonts['small_desc'], width - 80)
-                        self.draw.text((text_start_x, y + 55), date_truncated, font=self.fonts['small_desc'], fill=0)
-                        
-                        # Dekorativ linje för elegans
-                        line_start_x = text_start_x
-                        line_end_x = min(x + width - 20, text_start_x + 150)
-                        self.draw.line([(line_start_x, y + 80), (line_end_x, y + 80)], fill=0, width=1)
-                    
-                    elif module_name == 'status_module':
-                        update_time = datetime.now().strftime('%H:%M')
-                        
-                        # FIXED: Status med enkla prickar - PERFEKT LINJERING med text
-                        dot_x = x + 10
-                        dot_size = 3  # 3px prick
-                        
-                        # Status prick + text (perfekt centrerad)
-                        self.draw.ellipse([
-                            (dot_x, y + 28), 
-                            (dot_x + dot_size, y + 28 + dot_size)
-                        ], fill=0)
-                        self.draw.text((dot_x + 10, y + 20), "Status: OK", font=self.fonts['small_desc'], fill=0)
-                        
-                        # Update prick + text (perfekt centrerad)
-                        self.draw.ellipse([
-                            (dot_x, y + 53), 
-                            (dot_x + dot_size, y + 53 + dot_size)
-                        ], fill=0)
-                        self.draw.text((dot_x + 10, y + 45), f"Update: {update_time}", font=self.fonts['small_desc'], fill=0)
-                        
-                        # Data-källor prick + text (perfekt centrerad)
-                        data_sources = self.format_data_sources(weather_data)
-                        self.draw.ellipse([
-                            (dot_x, y + 78), 
-                            (dot_x + dot_size, y + 78 + dot_size)
-                        ], fill=0)
-                        self.draw.text((dot_x + 10, y + 70), f"Data: {data_sources}", font=self.fonts['small_desc'], fill=0)
+            # Rita alla aktiverade moduler enligt förberäknad geometri (se __init__)
+            for module_name, x, y, width, height, renderer in self._module_geom:
+                # Rita smarta modulramar direkt - main.py renderar högst en gång per process, så en
+                # förinspelad ramlista/ramlager (som i daemon) skulle bara kosta extra i __init__
+                self.draw_module_border(x, y, width, height, module_name)
+                
+                # Rita innehåll för varje modul MED NETATMO + SMHI DATA
+                renderer(x, y, width, height, weather_data, current_time)
             
             self.logger.info("🎨 Layout renderad med Netatmo + SMHI + HÖGUPPLÖSTA SVG-ikoner")
             
@@ -835,13 +577,241 @@ class EPaperWeatherApp:
             self.logger.error(f"❌ Fel vid rendering av layout: {e}")
             raise
     
+    def render_main_weather(self, x, y, width, height, weather_data, current_time):
+        """Hero-modul: plats, väderikon, temperatur, beskrivning och soltider"""
+        temp = weather_data.get('temperature', 20.0)
+        desc = weather_data.get('weather_description', 'Okänt väder')
+        temp_source = weather_data.get('temperature_source', 'fallback')
+        location = weather_data.get('location', 'Okänd plats')
+        smhi_symbol = weather_data.get('weather_symbol', 1)  # SMHI väder-symbol
+        
+        # Parsade soltider från weather_data
+        sunrise = weather_data.get('parsed_sunrise')
+        sunset = weather_data.get('parsed_sunset')
+        sun_data = weather_data.get('parsed_sun_data', {})
+        
+        # Plats överst i hero-modulen
+        self.draw.text((x + 20, y + 15), location, font=self.fonts['medium_desc'], fill=0)
+        
+        # VÄDERIKON med exakt dag/natt-logik - VERKLIG HÖGUPPLÖST STORLEK (96x96)
+        # Soltiderna skickas som redan parsade datetime - ingen isoformat-rundtur i icon_manager
+        weather_icon = self.icon_manager.get_weather_icon_for_time(
+            smhi_symbol, current_time, {'sunrise': sunrise, 'sunset': sunset}, size=(96, 96)
+        )
+        if weather_icon:
+            # Placera ikon till höger om temperaturen - justerad position för 96x96
+            icon_x = x + 320
+            icon_y = y + 50
+            self.paste_icon_on_canvas(weather_icon, icon_x, icon_y)
+            self.logger.debug(f"🎨 HERO väderikon: 96x96 SVG-baserad (symbol {smhi_symbol})")
+        
+        # TEMPERATUR (prioriterat från Netatmo!)
+        self.draw.text((x + 20, y + 60), f"{temp:.1f}°", font=self.fonts['hero_temp'], fill=0)
+        
+        # Beskrivning (från SMHI meteorologi)
+        desc_truncated = self.truncate_text(desc, self.fonts['hero_desc'], width - 40)
+        self.draw.text((x + 20, y + 150), desc_truncated, font=self.fonts['hero_desc'], fill=0)
+        
+        # NYTT: Visa temperatur-källa
+        if temp_source == 'netatmo':
+            source_text = "(NETATMO)"
+        elif temp_source == 'smhi':
+            source_text = "(SMHI)"
+        else:
+            source_text = f"({temp_source.upper()})"
+        
+        self.draw.text((x + 20, y + 185), source_text, font=self.fonts['tiny'], fill=0)
+        
+        # EXAKTA SOL-IKONER + tider - HÖGUPPLÖST STORLEK (56x56)
+        if sunrise and sunset:
+            sunrise_str = sunrise.strftime('%H:%M')
+            sunset_str = sunset.strftime('%H:%M')
+            
+            # Soluppgång - ikon + exakt tid
+            sunrise_icon = self.icon_manager.get_sun_icon('sunrise', size=(56, 56))
+            if sunrise_icon:
+                self.paste_icon_on_canvas(sunrise_icon, x + 20, y + 200)
+                self.draw.text((x + 80, y + 215), sunrise_str, font=self.fonts['medium_desc'], fill=0)
+                self.logger.debug(f"🌅 Sol-ikon: 56x56 SVG-baserad")
+            else:
+                # Fallback utan ikon
+                self.draw.text((x + 20, y + 215), f"🌅 {sunrise_str}", font=self.fonts['medium_desc'], fill=0)
+            
+            # Solnedgång - ikon + exakt tid  
+            sunset_icon = self.icon_manager.get_sun_icon('sunset', size=(56, 56))
+            if sunset_icon:
+                self.paste_icon_on_canvas(sunset_icon, x + 180, y + 200)
+                self.draw.text((x + 240, y + 215), sunset_str, font=self.fonts['medium_desc'], fill=0)
+                self.logger.debug(f"🌇 Sol-ikon: 56x56 SVG-baserad")
+            else:
+                # Fallback utan ikon
+                self.draw.text((x + 180, y + 215), f"🌇 {sunset_str}", font=self.fonts['medium_desc'], fill=0)
+        
+        # NYTT: Visa soldata-källa (diskret)
+        sun_source = sun_data.get('source', 'unknown')
+        if sun_source != 'unknown':
+            source_text = f"Sol: {sun_source}"
+            if sun_source == 'ipgeolocation.io':
+                source_text = "Sol: API ✓"
+            elif sun_source == 'fallback':
+                source_text = "Sol: approx"
+            self.draw.text((x + 20, y + 250), source_text, font=self.fonts['tiny'], fill=0)
+    
+    def render_barometer(self, x, y, width, height, weather_data, current_time):
+        """Barometer-modul: lufttryck, 3h-trend och trendpil"""
+        # 🚨 FIXED: Använd RIKTIGA trycktrend-data från weather_client
+        pressure = weather_data.get('pressure', 1013)
+        pressure_source = weather_data.get('pressure_source', 'unknown')
+        
+        # ANVÄND RIKTIGA TREND-DATA från weather_client.py
+        pressure_trend = weather_data.get('pressure_trend', {})
+        trend_text = weather_data.get('pressure_trend_text', 'Samlar data')
+        trend_arrow = weather_data.get('pressure_trend_arrow', 'stable')
+        
+        # 🎯 LOGGA VAD VI FAKTISKT FÅR
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"🔍 BAROMETER DEBUG: pressure_trend={pressure_trend} trend_text={trend_text} trend_arrow={trend_arrow}")
+        
+        # Barometer-ikon - HÖGUPPLÖST STORLEK (80x80)
+        barometer_icon = self.icon_manager.get_system_icon('barometer', size=(80, 80))
+        if barometer_icon:
+            self.paste_icon_on_canvas(barometer_icon, x + 15, y + 20)
+            # Tryck-värde bredvid ikon (justerad position för större ikon)
+            self.draw.text((x + 100, y + 40), f"{int(pressure)}", font=self.fonts['medium_main'], fill=0)
+            self.logger.debug(f"📊 Barometer-ikon: 80x80 SVG-baserad")
+        else:
+            # Fallback utan ikon
+            self.draw.text((x + 20, y + 50), f"{int(pressure)}", font=self.fonts['medium_main'], fill=0)
+        
+        # hPa-text (FIXAD: Flyttad längre ner för att inte kollidera med siffran)
+        self.draw.text((x + 100, y + 100), "hPa", font=self.fonts['medium_desc'], fill=0)
+        
+        # RIKTIGA TREND-TEXT (från 3h-analys) - RADBRYTS OM DET ÄR "Samlar data"
+        if trend_text == 'Samlar data':
+            self.draw.text((x + 20, y + 125), "Samlar", font=self.fonts['medium_desc'], fill=0)
+            self.draw.text((x + 20, y + 150), "data", font=self.fonts['medium_desc'], fill=0)
+        else:
+            self.draw.text((x + 20, y + 125), trend_text, font=self.fonts['medium_desc'], fill=0)
+        
+        # BONUS: Visa numerisk 3h-förändring om tillgänglig
+        if pressure_trend.get('change_3h') is not None and pressure_trend.get('trend') != 'insufficient_data':
+            change_3h = pressure_trend['change_3h']
+            change_text = f"{change_3h:+.1f} hPa/3h"
+            # Placera under trend-text, anpassat för radbrytsning
+            change_y = y + 175 if trend_text == 'Samlar data' else y + 150
+            self.draw.text((x + 20, change_y), change_text, font=self.fonts['small_desc'], fill=0)
+        
+        # TREND-PIL från Weather Icons - OPTIMERAD STORLEK (64x64)
+        trend_icon = self.icon_manager.get_pressure_icon(trend_arrow, size=(64, 64))
+        if trend_icon:
+            # Höger sida av modulen, optimerad position för 64x64
+            trend_x = x + width - 75  # 75px från höger kant för 64px ikon
+            trend_y = y + 100  # Centrerad vertikalt
+            self.paste_icon_on_canvas(trend_icon, trend_x, trend_y)
+            self.logger.debug(f"↗️ Trycktrend-pil: 64x64 SVG-baserad ({trend_arrow})")
+        
+        # NYTT: Visa tryck-källa (diskret) - FLYTTAD FÖR ATT INTE KOLLIDERA MED PIL
+        if pressure_source == 'netatmo':
+            self.draw.text((x + 20, y + height - 20), "(Netatmo)", font=self.fonts['tiny'], fill=0)
+        elif pressure_source == 'smhi':
+            self.draw.text((x + 20, y + height - 20), "(SMHI)", font=self.fonts['tiny'], fill=0)
+    
+    def render_tomorrow_forecast(self, x, y, width, height, weather_data, current_time):
+        """Imorgon-modul: SMHI-prognos för morgondagen"""
+        tomorrow = weather_data.get('tomorrow', {})
+        tomorrow_temp = tomorrow.get('temperature', 18.0)
+        tomorrow_desc = tomorrow.get('weather_description', 'Okänt')
+        tomorrow_symbol = tomorrow.get('weather_symbol', 3)
+        
+        # "Imorgon" titel
+        self.draw.text((x + 20, y + 30), "Imorgon", font=self.fonts['medium_desc'], fill=0)
+        
+        # Imorgon väderikon - HÖGUPPLÖST STORLEK (80x80)
+        tomorrow_icon = self.icon_manager.get_weather_icon(tomorrow_symbol, is_night=False, size=(80, 80))
+        if tomorrow_icon:
+            self.paste_icon_on_canvas(tomorrow_icon, x + 140, y + 20)
+            self.logger.debug(f"🌦️ Prognos-ikon: 80x80 SVG-baserad (symbol {tomorrow_symbol})")
+        
+        # Temperatur (alltid från SMHI-prognos)
+        self.draw.text((x + 20, y + 80), f"{tomorrow_temp:.1f}°", font=self.fonts['medium_main'], fill=0)
+        
+        # Väderbeskrivning
+        desc_truncated = self.truncate_text(tomorrow_desc, self.fonts['small_desc'], width - 60)
+        self.draw.text((x + 20, y + 130), desc_truncated, font=self.fonts['small_desc'], fill=0)
+        
+        # NYTT: Visa att det är SMHI-prognos
+        self.draw.text((x + 20, y + 155), "(SMHI prognos)", font=self.fonts['tiny'], fill=0)
+    
+    def render_clock(self, x, y, width, height, weather_data, current_time):
+        """Datummodul: svensk veckodag och datum"""
+        # OMVANDLAD TILL ELEGANT DATUMMODUL - INGEN KLOCKA LÄNGRE
+        # Hämta svenska datum-komponenter
+        swedish_weekday, swedish_date = self.get_swedish_date(current_time)
+        
+        # Kalenderdakts-ikon för modern utseende
+        calendar_icon = self.icon_manager.get_system_icon('calendar', size=(40, 40))
+        if calendar_icon:
+            # Placera ikon till vänster
+            self.paste_icon_on_canvas(calendar_icon, x + 15, y + 20)
+            text_start_x = x + 65  # Text börjar efter ikon
+        else:
+            # Fallback: ingen ikon, text börjar tidigare
+            text_start_x = x + 15
+        
+        # VECKODAG (stor och tydlig)
+        weekday_truncated = self.truncate_text(swedish_weekday, self.fonts['small_main'], width - 80)
+        self.draw.text((text_start_x, y + 20), weekday_truncated, font=self.fonts['small_main'], fill=0)
+        
+        # DATUM (elegant under veckodagen)
+        date_truncated = self.truncate_text(swedish_date, self.fonts['small_desc'], width - 80)
+        self.draw.text((text_start_x, y + 55), date_truncated, font=self.fonts['small_desc'], fill=0)
+        
+        # Dekorativ linje för elegans
+        line_start_x = text_start_x
+        line_end_x = min(x + width - 20, text_start_x + 150)
+        self.draw.line([(line_start_x, y + 80), (line_end_x, y + 80)], fill=0, width=1)
+    
+    def render_status(self, x, y, width, height, weather_data, current_time):
+        """Status-modul: status, uppdateringstid och datakällor"""
+        update_time = current_time.strftime('%H:%M')
+        
+        # FIXED: Status med enkla prickar - PERFEKT LINJERING med text
+        dot_x = x + 10  # 3px prick (self._dot_mask)
+        
+        # Status prick + text (perfekt centrerad)
+        self.canvas.paste(0, (dot_x, y + 28), self._dot_mask)
+        self.draw.text((dot_x + 10, y + 20), "Status: OK", font=self.fonts['small_desc'], fill=0)
+        
+        # Update prick + text (perfekt centrerad)
+        self.canvas.paste(0, (dot_x, y + 53), self._dot_mask)
+        self.draw.text((dot_x + 10, y + 45), f"Update: {update_time}", font=self.fonts['small_desc'], fill=0)
+        
+        # Data-källor prick + text (perfekt centrerad)
+        data_sources = self.format_data_sources(weather_data)
+        self.canvas.paste(0, (dot_x, y + 78), self._dot_mask)
+        self.draw.text((dot_x + 10, y + 70), f"Data: {data_sources}", font=self.fonts['small_desc'], fill=0)
+    
+    def get_frame_buffer(self) -> bytearray:
+        """
+        Displaybuffer för canvas utan att gå via epd.getbuffer när det går
+        
+        Canvas är 1-bit (mode '1') och Pillows råformat är panelens packade format:
+        8 pixlar per byte, MSB först, 1 = vit. Samma orientering → bytes skickas direkt.
+        """
+        if (getattr(self.epd, 'width', None), getattr(self.epd, 'height', None)) == self.canvas.size:
+            return bytearray(self.canvas.tobytes())
+        return self.epd.getbuffer(self.canvas)
+    
     def display_canvas(self, force_update=False, update_reason=""):
         """Visa canvas på E-Paper display - SMART UPPDATERING"""
         try:
+            if force_update and self.epd is None and not self.config['debug']['test_mode']:
+                self.init_display()
+            
             if self.epd and not self.config['debug']['test_mode']:
                 if force_update:
                     self.logger.info(f"📱 UPPDATERAR E-Paper display: {update_reason}")
-                    self.epd.display(self.epd.getbuffer(self.canvas))
+                    self.epd.display(self.get_frame_buffer())
                     self.logger.info("✅ E-Paper display uppdaterad")
                 else:
                     self.logger.info("📱 E-Paper display behåller befintlig bild")
@@ -864,12 +834,14 @@ class EPaperWeatherApp:
             cutoff_time = time.time() - (30 * 24 * 3600)  # 30 dagar sedan
             files_removed = 0
             
-            for filename in os.listdir(screenshot_dir):
-                filepath = os.path.join(screenshot_dir, filename)
-                if os.path.isfile(filepath) and filename.endswith('.png'):
-                    if os.path.getmtime(filepath) < cutoff_time:
-                        os.remove(filepath)
-                        files_removed += 1
+            # scandir: filtyp kommer från katalogläsningen och stat() cachas per DirEntry,
+            # namnet kontrolleras först så att bara .png-filer stat:as
+            with os.scandir(screenshot_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.png') and entry.is_file():
+                        if entry.stat().st_mtime < cutoff_time:
+                            os.remove(entry.path)
+                            files_removed += 1
             
             if files_removed > 0:
                 self.logger.info(f"🗑️ Rensade {files_removed} gamla screenshots (>30 dagar)")
@@ -879,7 +851,31 @@ class EPaperWeatherApp:
         except Exception as e:
             self.logger.error(f"⚠️ Fel vid rensning av screenshots: {e}")
     
-    def save_startup_screenshot(self, update_reason=""):
+    def _save_canvas_screenshots(self, screenshot_dir, filename_prefix):
+        """
+        Spara canvas som screenshot-fil(er)
+        
+        1-bit-versionen (E-Paper native) sparas alltid. Visningskopian kostar en extra
+        bildallokering per sparning och skapas bara med debug.rgb_screenshots = true -
+        då i gråskala ('L', 1 byte/pixel istället för 3 med RGB).
+        
+        Returns:
+            Sökväg till filen som ska loggas (visningskopian om den skapats)
+        """
+        # Snabb deflate - svartvita skärmbilder blir bara marginellt större än med standardnivå 6
+        png_options = {'format': 'PNG', 'optimize': False, 'compress_level': 1}
+        
+        original_filename = f"{screenshot_dir}/1bit_{filename_prefix}.png"
+        self.canvas.save(original_filename, **png_options)
+        
+        if not self.config.get('debug', {}).get('rgb_screenshots', False):
+            return original_filename
+        
+        view_filename = f"{screenshot_dir}/{filename_prefix}.png"
+        self.canvas.convert('L').save(view_filename, **png_options)
+        return view_filename
+    
+    def save_startup_screenshot(self, update_reason="", now=None):
         """Spara screenshot endast vid första körning efter reboot ELLER vid faktisk uppdatering"""
         try:
             # Marker-fil i /tmp (rensas automatiskt vid reboot)
@@ -899,7 +895,7 @@ class EPaperWeatherApp:
             if not os.path.exists(marker_file):
                 self.cleanup_old_screenshots()
             
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
             
             # Bestäm filnamnsprefix baserat på anledning
             if update_reason:
@@ -910,14 +906,7 @@ class EPaperWeatherApp:
                 prefix = "startup"
                 filename_prefix = f"{prefix}_{timestamp}"
             
-            # Spara original 1-bit format (E-Paper native)
-            original_filename = f"{screenshot_dir}/1bit_{filename_prefix}.png"
-            self.canvas.save(original_filename)
-            
-            # Konvertera till RGB för bättre visning
-            rgb_canvas = self.canvas.convert('RGB')
-            rgb_filename = f"{screenshot_dir}/{filename_prefix}.png"
-            rgb_canvas.save(rgb_filename)
+            rgb_filename = self._save_canvas_screenshots(screenshot_dir, filename_prefix)
             
             # Skapa marker-fil för att förhindra startup-dubletter
             if not update_reason:
@@ -942,14 +931,7 @@ class EPaperWeatherApp:
             
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
-            # Spara original 1-bit format
-            original_filename = f"{screenshot_dir}/1bit_manual_{timestamp}.png"
-            self.canvas.save(original_filename)
-            
-            # Konvertera till RGB för bättre visning
-            rgb_canvas = self.canvas.convert('RGB')
-            rgb_filename = f"{screenshot_dir}/manual_{timestamp}.png"
-            rgb_canvas.save(rgb_filename)
+            rgb_filename = self._save_canvas_screenshots(screenshot_dir, f"manual_{timestamp}")
             
             self.logger.info(f"📸 Manuell screenshot sparad: {rgb_filename}")
             print(f"📸 Manual screenshot: {rgb_filename}")
@@ -968,24 +950,27 @@ class EPaperWeatherApp:
             # STEG 2: Hämta väderdata UTAN att rendera till canvas
             weather_data = self.fetch_weather_data()
             
+            # En tidsstämpel för hela körningen (jämförelse, rendering, screenshot och cache)
+            now = datetime.now()
+            
             # STEG 3: Avgör om displayen behöver uppdateras
-            should_update, reason = self.should_update_display(weather_data, last_values)
+            should_update, reason = self.should_update_display(weather_data, last_values, now)
             
             if should_update:
                 # UPPDATERA SKÄRM: Förändring detekterad eller watchdog
                 self.logger.info(f"🔄 UPPDATERAR skärm: {reason}")
                 
                 # Rendera layout BARA när vi ska uppdatera
-                self.render_weather_layout(weather_data)
+                self.render_weather_layout(weather_data, now)
                 
                 # Ta screenshot vid uppdatering (visar vad som faktiskt renderas)
-                self.save_startup_screenshot(update_reason=reason)
+                self.save_startup_screenshot(update_reason=reason, now=now)
                 
                 # Visa på display
                 self.display_canvas(force_update=True, update_reason=reason)
                 
                 # Spara nya värden till cache
-                self.save_current_values(weather_data)
+                self.save_current_values(weather_data, now)
                 
                 print(f"\n✅ E-Paper uppdaterad: {reason}")
                 
@@ -26,13 +26,20 @@ DAEMON VERSION baserad på avancerad main.py:
 
 import sys
 import os
+import re
+import ast
 import json
+import string
 import time
 import signal
+import queue
+import hashlib
 import logging
+import threading
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Any
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, ImageChops
 
 # Lägg till projektets moduler
 sys.path.append('modules')
@@ -40,6 +47,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'e-Paper', 'RaspberryPi_
 
 from weather_client import WeatherClient
 from icon_manager import WeatherIconManager
+from display_spec import COMPARE_SPEC, get_path, extract_compare_values, compare_digest, draw_border
 
 # NYT: Import nya renderer-systemet
 from modules.renderers.module_factory import ModuleFactory
@@ -50,6 +58,24 @@ except ImportError as e:
     print(f"❌ Kan inte importera Waveshare bibliotek: {e}")
     sys.exit(1)
 
+# NumPy och Numba är valfria - används bara för stora trigger-regeluppsättningar
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Svenska veckodagar indexerade med date.weekday(), KORTA månadsnamn med date.month
+SWEDISH_WEEKDAYS = ('Måndag', 'Tisdag', 'Onsdag', 'Torsdag', 'Fredag', 'Lördag', 'Söndag')
+SWEDISH_MONTHS_SHORT = (None, 'Jan', 'Feb', 'Mars', 'April', 'Maj', 'Juni',
+                        'Juli', 'Aug', 'Sep', 'Okt', 'Nov', 'Dec')
+
 
 class TriggerEvaluator:
     """
@@ -58,6 +84,22 @@ class TriggerEvaluator:
     Stöder conditions som: "precipitation > 0 OR forecast_precipitation_2h > 0.2"
     """
     
+    # Logiska operatorer i config-syntax → Python-syntax (ett regex-pass)
+    OPERATOR_PATTERN = re.compile(r'\b(AND|OR|NOT)\b')
+    OPERATOR_MAP = {'AND': 'and', 'OR': 'or', 'NOT': 'not'}
+    
+    # Översättningstabell som tar bort alla tillåtna tecken - blir något kvar är det otillåtet
+    ALLOWED_CHARS_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + "_.<>=!()'\" \t+-*/")
+    
+    # Tillåtna AST-noder i en kompilerad condition (allt annat avvisas)
+    ALLOWED_NODES = (
+        ast.Expression, ast.BoolOp, ast.And, ast.Or,
+        ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+        ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div,
+        ast.Compare, ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq,
+        ast.Name, ast.Load, ast.Constant
+    )
+    
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.TriggerEvaluator")
         
@@ -73,6 +115,14 @@ class TriggerEvaluator:
             'user_preference': self._get_user_preference,
             'is_daylight': self._get_is_daylight
         }
+        
+        # Ett kombinerat mönster för alla function-namn: längsta först för att undvika
+        # partiella ersättningar, word boundaries för exakt matchning
+        sorted_names = sorted(self.safe_functions, key=len, reverse=True)
+        self._function_pattern = re.compile(r'\b(' + '|'.join(map(re.escape, sorted_names)) + r')\b')
+        
+        # Cache: rå condition-sträng → (code object, [(variabelnamn, function)]) eller None om osäker
+        self._compiled_conditions: Dict[str, Optional[tuple]] = {}
     
     def evaluate_condition(self, condition: str, context: Dict) -> bool:
         """
@@ -89,71 +139,111 @@ class TriggerEvaluator:
             if not condition or not isinstance(condition, str):
                 return False
             
-            # Ersätt function calls med värden
-            evaluated_condition = self._replace_functions_with_values(condition, context)
+            # Kompilera bara första gången en condition dyker upp
+            if condition not in self._compiled_conditions:
+                self.compile_condition(condition)
+            
+            compiled = self._compiled_conditions[condition]
+            if compiled is None:
+                return False
             
-            # Säker evaluation av logisk expression
-            result = self._safe_eval_logic(evaluated_condition)
+            code, variables = compiled
+            values = self.resolve_variables(variables, context)
             
-            self.logger.debug(f"🎯 Trigger condition: '{condition}' → '{evaluated_condition}' → {result}")
+            # Säker evaluation av förkompilerad bytecode utan builtins
+            result = bool(eval(code, {'__builtins__': {}}, values))
+            
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"🎯 Trigger condition: '{condition}' med {values} → {result}")
             return result
             
         except Exception as e:
             self.logger.error(f"❌ Fel vid trigger evaluation: {condition} - {e}")
             return False
     
-    def _replace_functions_with_values(self, condition: str, context: Dict) -> str:
-        """Ersätt function calls med faktiska värden"""
-        import re
-        result = condition
-        
-        # Sortera functions efter längd (längsta först) för att undvika partiella ersättningar
-        sorted_functions = sorted(self.safe_functions.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        for func_name, func in sorted_functions:
-            # Använd word boundaries för exakt matchning
-            pattern = r'\b' + re.escape(func_name) + r'\b'
-            if re.search(pattern, result):
-                try:
-                    value = func(context)
-                    # Ersätt HELA function name med värdet
-                    result = re.sub(pattern, str(value), result)
-                    self.logger.debug(f"🔄 Replaced {func_name} → {value}")
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Function {func_name} fel: {e}")
-                    result = re.sub(pattern, "0", result)  # Fallback
-        
-        return result
-    
-    def _safe_eval_logic(self, expression: str) -> bool:
+    def compile_condition(self, condition: str) -> Optional[tuple]:
         """
-        Säker evaluation av logisk expression
-        Endast tillåter: numbers, operators (>, <, >=, <=, ==, !=), AND, OR, NOT, ()
+        Kompilera en condition en gång och cacha resultatet
+        
+        Args:
+            condition: Condition string från config
+            
+        Returns:
+            Tuple (code, variables) eller None om condition är osäker/ogiltig
         """
+        compiled = None
         try:
-            # Whitelist för tillåtna tokens
-            allowed_chars = set('0123456789.<>=!() ')
-            allowed_words = {'AND', 'OR', 'NOT', 'True', 'False'}
-            
-            # Ersätt logiska operatorer med Python syntax
-            expression = expression.replace(' AND ', ' and ')
-            expression = expression.replace(' OR ', ' or ')
-            expression = expression.replace(' NOT ', ' not ')
-            
-            # Kontrollera att endast säkra tokens används
-            tokens = expression.split()
-            for token in tokens:
-                if not (all(c in allowed_chars for c in token) or token in allowed_words or token in ['and', 'or', 'not']):
-                    self.logger.warning(f"⚠️ Osäker token i expression: {token}")
-                    return False
-            
-            # Evaluera expression
-            result = eval(expression)
-            return bool(result)
+            expression, variables = self.build_expression(condition)
+            compiled = (compile(expression, '<trigger>', 'eval'), variables)
+            self.logger.debug(f"🧩 Condition kompilerad: '{condition}' → '{expression}'")
             
         except Exception as e:
-            self.logger.error(f"❌ Fel vid logic evaluation: {expression} - {e}")
-            return False
+            self.logger.warning(f"⚠️ Osäker eller ogiltig condition: '{condition}' - {e}")
+        
+        self._compiled_conditions[condition] = compiled
+        return compiled
+    
+    def build_expression(self, condition: str) -> tuple:
+        """
+        Översätt condition till ett validerat Python-uttryck
+        
+        Function-namn ersätts med variabler (t.ex. precipitation → _v_precipitation)
+        så att värden binds direkt vid evaluation istället för att klistras in som text.
+        Endast tillåter: numbers, strängar, operators (>, <, >=, <=, ==, !=), AND, OR, NOT, ()
+        
+        Args:
+            condition: Condition string från config
+            
+        Returns:
+            Tuple (expression, variables) där variables är [(variabelnamn, function)]
+            
+        Raises:
+            ValueError/SyntaxError om condition är osäker eller ogiltig
+        """
+        template, variables = self._replace_functions_with_variables(condition)
+        
+        # Ersätt logiska operatorer med Python syntax
+        expression = self.OPERATOR_PATTERN.sub(lambda m: self.OPERATOR_MAP[m.group(0)], template)
+        
+        # Snabb teckenkontroll innan parsning
+        illegal_chars = expression.translate(self.ALLOWED_CHARS_TABLE)
+        if illegal_chars:
+            raise ValueError(f"otillåtna tecken {illegal_chars!r}")
+        
+        tree = ast.parse(expression, mode='eval')
+        allowed_names = {var_name for var_name, _ in variables}
+        
+        for node in ast.walk(tree):
+            if not isinstance(node, self.ALLOWED_NODES):
+                raise ValueError(f"otillåten konstruktion {type(node).__name__}")
+            if isinstance(node, ast.Name) and node.id not in allowed_names:
+                raise ValueError(f"okänt namn {node.id}")
+        
+        return expression, variables
+    
+    def _replace_functions_with_variables(self, condition: str) -> tuple:
+        """Ersätt function calls med variabelnamn för kompilering (ett regex-pass)"""
+        variables = {}
+        
+        def substitute(match):
+            func_name = match.group(0)
+            var_name = f"_v_{func_name}"
+            variables[var_name] = self.safe_functions[func_name]
+            return var_name
+        
+        result = self._function_pattern.sub(substitute, condition)
+        return result, list(variables.items())
+    
+    def resolve_variables(self, variables: List[tuple], context: Dict) -> Dict[str, Any]:
+        """Hämta aktuella värden för en kompilerad conditions variabler"""
+        values = {}
+        for var_name, func in variables:
+            try:
+                values[var_name] = func(context)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Function {var_name[3:]} fel: {e}")
+                values[var_name] = 0  # Fallback
+        return values
     
     # Whitelisted functions för context data
     def _get_precipitation(self, context: Dict) -> float:
@@ -177,12 +267,14 @@ class TriggerEvaluator:
         return str(context.get('pressure_trend_arrow', 'stable'))
     
     def _get_current_hour(self, context: Dict) -> int:
-        """Hämta aktuell timme"""
-        return datetime.now().hour
+        """Hämta aktuell timme (från context-tidsstämpeln om den finns)"""
+        hour = context.get('time_hour')
+        return int(hour) if hour is not None else datetime.now().hour
     
     def _get_current_month(self, context: Dict) -> int:
-        """Hämta aktuell månad"""
-        return datetime.now().month
+        """Hämta aktuell månad (från context-tidsstämpeln om den finns)"""
+        month = context.get('time_month')
+        return int(month) if month is not None else datetime.now().month
     
     def _get_user_preference(self, context: Dict) -> str:
         """Hämta användarpreferens från context"""
@@ -200,6 +292,18 @@ class DynamicModuleManager:
     Kärnkomponent i Dynamic Module System för villkorsbaserade layout-ändringar
     """
     
+    # Numba används bara för regeluppsättningar med minst så här många triggers
+    NUMBA_MIN_TRIGGERS = 32
+    
+    # Enkla tröskel-triggers (<variabel> <op> <tal>) vektoriseras med NumPy från så här många
+    VECTORIZE_MIN_TRIGGERS = 8
+    
+    # Trigger-functions som alltid ger numeriska värden (kan packas i en float64-vektor)
+    NUMERIC_FUNCTIONS = {
+        'precipitation', 'forecast_precipitation_2h', 'temperature', 'wind_speed',
+        'time_hour', 'time_month', 'is_daylight'
+    }
+    
     def __init__(self, config: Dict):
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.DynamicModuleManager")
@@ -212,6 +316,25 @@ class DynamicModuleManager:
         # Trigger evaluator för condition evaluation
         self.trigger_evaluator = TriggerEvaluator()
         
+        # Triggers i priority-ordning (skippa kommentarer) - sorteras en gång
+        self._sorted_triggers = sorted(
+            [(name, config) for name, config in self.triggers.items()
+             if not name.startswith('_') and isinstance(config, dict)],
+            key=lambda x: x[1].get('priority', 50),
+            reverse=True  # Högsta priority först
+        )
+        
+        # Default groups (normal för alla sections) - module_groups ändras inte under körning
+        self._default_active_groups = {}
+        for section_name, groups in self.module_groups.items():
+            if 'normal' in groups:
+                self._default_active_groups[section_name] = 'normal'
+            else:
+                # Använd första tillgängliga group som default
+                first_group = next(iter(groups), None)
+                if first_group:
+                    self._default_active_groups[section_name] = first_group
+        
         # State tracking för layout-ändringar
         self.current_active_groups = {}
         self.last_trigger_evaluation = 0
@@ -227,6 +350,204 @@ class DynamicModuleManager:
                 continue
             condition = trigger_config.get('condition', 'N/A')
             self.logger.info(f"   🎯 {trigger_name}: '{condition}'")
+
+            # Förkompilera condition en gång (parsning hålls borta från daemon-loopen)
+            if condition and isinstance(condition, str):
+                self.trigger_evaluator.compile_condition(condition)
+        
+        # Hela regeluppsättningen kompilerad till en funktion (None = använd trigger-loopen)
+        self._compiled_ruleset = self._compile_ruleset()
+        self._numba_ruleset = self._compile_numba_ruleset()
+        
+        # Cache (storlek 1) för senaste trigger-resultat: trigger-värden → aktiva groups
+        self._trigger_cache_key = None
+        self._trigger_cache_val = None
+    
+    def _collect_ruleset_entries(self) -> List[tuple]:
+        """
+        Samla giltiga triggers i priority-ordning för kompilering
+        
+        Returns:
+            Lista av (trigger_name, expression, variables, target_section, activate_group)
+        """
+        entries = []
+        
+        for trigger_name, trigger_config in self._sorted_triggers:
+            condition = trigger_config.get('condition', '')
+            target_section = trigger_config.get('target_section', '')
+            activate_group = trigger_config.get('activate_group', '')
+            
+            # Ofullständiga/ogiltiga triggers kan aldrig aktiveras - hoppa över
+            if not all([condition, target_section, activate_group]) or not isinstance(condition, str):
+                continue
+            
+            try:
+                expression, variables = self.trigger_evaluator.build_expression(condition)
+            except Exception:
+                continue
+            
+            entries.append((trigger_name, expression, variables, target_section, activate_group))
+        
+        return entries
+    
+    def _compile_ruleset(self) -> Optional[tuple]:
+        """
+        Generera och kompilera en Python-funktion för alla triggers i priority-ordning
+        
+        Varje trigger blir en rak if-sats: if <condition>: active[section] = group.
+        Enkla tröskel-triggers läser istället sitt utfall ur en förberäknad vektor
+        (threshold[k]) när de vektoriseras med NumPy.
+        
+        Returns:
+            Tuple (function, variables, threshold_spec) eller None om kompileringen misslyckas
+        """
+        try:
+            entries = self._collect_ruleset_entries()
+            thresholds = self._classify_threshold_triggers(entries)
+            
+            variables = {}
+            body = []
+            
+            for i, (trigger_name, expression, condition_variables, target_section, activate_group) in enumerate(entries):
+                variables.update(condition_variables)
+                if i in thresholds:
+                    body.append(f"    if threshold[{thresholds[i][0]}]:")
+                else:
+                    body.append(f"    if {expression}:")
+                body.append(f"        active[{target_section!r}] = {activate_group!r}")
+                body.append(f"        fired.append({trigger_name!r})")
+            
+            params = ''.join(f", {var_name}" for var_name in sorted(variables))
+            source = f"def _evaluate_ruleset(active, fired, threshold{params}):\n"
+            source += "\n".join(body) if body else "    pass"
+            
+            namespace = {'__builtins__': {}}
+            exec(compile(source, '<trigger-ruleset>', 'exec'), namespace)
+            
+            threshold_spec = self._build_threshold_spec(list(thresholds.values())) if thresholds else None
+            
+            self.logger.debug(f"🧩 Trigger-regler kompilerade:\n{source}")
+            return namespace['_evaluate_ruleset'], list(variables.items()), threshold_spec
+            
+        except Exception as e:
+            self.logger.warning(f"⚠️ Kunde inte kompilera trigger-regler, använder trigger-loop: {e}")
+            return None
+    
+    def _classify_threshold_triggers(self, entries: List[tuple]) -> Dict[int, tuple]:
+        """
+        Hitta enkla tröskel-triggers (<numerisk variabel> <op> <tal>) för NumPy-vektorisering
+        
+        Returns:
+            Dict entry-index → (vektor-position, variabelnamn, AST-operator, tröskel).
+            Tom om NumPy saknas eller om de enkla triggers är för få för att löna sig.
+        """
+        if not NUMPY_AVAILABLE:
+            return {}
+        
+        thresholds = {}
+        for i, entry in enumerate(entries):
+            node = ast.parse(entry[1], mode='eval').body
+            if not (isinstance(node, ast.Compare) and len(node.ops) == 1):
+                continue
+            if not (isinstance(node.left, ast.Name) and node.left.id[3:] in self.NUMERIC_FUNCTIONS):
+                continue
+            
+            # Tröskel: tal-konstant, eventuellt med minustecken
+            comparator, sign = node.comparators[0], 1
+            if isinstance(comparator, ast.UnaryOp) and isinstance(comparator.op, ast.USub):
+                comparator, sign = comparator.operand, -1
+            if not (isinstance(comparator, ast.Constant) and type(comparator.value) in (int, float)):
+                continue
+            
+            thresholds[i] = (len(thresholds), node.left.id, type(node.ops[0]), sign * comparator.value)
+        
+        return thresholds if len(thresholds) >= self.VECTORIZE_MIN_TRIGGERS else {}
+    
+    def _build_threshold_spec(self, thresholds: List[tuple]) -> tuple:
+        """Packa tröskel-triggers i parallella NumPy-arrayer för vektoriserad evaluation"""
+        ufuncs = {
+            ast.Gt: np.greater, ast.GtE: np.greater_equal,
+            ast.Lt: np.less, ast.LtE: np.less_equal,
+            ast.Eq: np.equal, ast.NotEq: np.not_equal
+        }
+        
+        variable_order = sorted({var_name for _, var_name, _, _ in thresholds})
+        index = {var_name: i for i, var_name in enumerate(variable_order)}
+        
+        variable_index = np.array([index[var_name] for _, var_name, _, _ in thresholds], dtype=np.int32)
+        limits = np.array([limit for _, _, _, limit in thresholds], dtype=np.float64)
+        ops = [op for _, _, op, _ in thresholds]
+        
+        # En (ufunc, mask) per operator som faktiskt förekommer
+        op_masks = [(ufunc, np.array([op is op_type for op in ops]))
+                    for op_type, ufunc in ufuncs.items() if op_type in ops]
+        
+        self.logger.info(f"📐 {len(thresholds)} tröskel-triggers vektoriseras med NumPy")
+        return variable_order, variable_index, limits, op_masks
+    
+    def _evaluate_threshold_triggers(self, threshold_spec: tuple, values: Dict[str, Any]):
+        """Evaluera alla tröskel-triggers med några få vektoriserade jämförelser"""
+        variable_order, variable_index, limits, op_masks = threshold_spec
+        
+        context_vector = np.array([float(values[var_name]) for var_name in variable_order])
+        lhs = context_vector[variable_index]
+        
+        outcomes = np.zeros(len(limits), dtype=bool)
+        for ufunc, mask in op_masks:
+            outcomes |= mask & ufunc(lhs, limits)
+        
+        return outcomes
+    
+    def _compile_numba_ruleset(self) -> Optional[tuple]:
+        """
+        OPTIONELLT: Kompilera stora, rent numeriska regeluppsättningar till maskinkod med Numba
+        
+        Alla trigger-värden packas i en float64-vektor och funktionen returnerar en
+        bool-vektor med utfall per trigger. Används bara om Numba finns och regeluppsättningen
+        är stor nog för att kompileringstiden vid start ska löna sig.
+        
+        Returns:
+            Tuple (function, variable_order, [(trigger_name, section, group)]) eller None
+        """
+        if not NUMBA_AVAILABLE:
+            return None
+        
+        entries = self._collect_ruleset_entries()
+        if len(entries) < self.NUMBA_MIN_TRIGGERS:
+            return None
+        
+        try:
+            variable_order = sorted({var_name for entry in entries for var_name, _ in entry[2]})
+            
+            # Endast numeriska variabler och konstanter - strängjämförelser stannar i Python
+            if any(var_name[3:] not in self.NUMERIC_FUNCTIONS for var_name in variable_order):
+                return None
+            if any("'" in entry[1] or '"' in entry[1] for entry in entries):
+                return None
+            
+            index = {var_name: i for i, var_name in enumerate(variable_order)}
+            body = [f"    fired = np.zeros({len(entries)}, np.bool_)"]
+            
+            for i, entry in enumerate(entries):
+                vector_expression = re.sub(r'\b_v_\w+\b', lambda m: f"ctx[{index[m.group(0)]}]", entry[1])
+                body.append(f"    if {vector_expression}:")
+                body.append(f"        fired[{i}] = True")
+            
+            body.append("    return fired")
+            source = "def _evaluate_ruleset_vector(ctx):\n" + "\n".join(body)
+            
+            namespace = {'np': np}
+            exec(compile(source, '<trigger-ruleset-numba>', 'exec'), namespace)
+            
+            # Explicit signatur → kompileras direkt här vid start, inte vid första tick
+            vector_function = numba.njit('boolean[:](float64[:])', nogil=True)(namespace['_evaluate_ruleset_vector'])
+            
+            self.logger.info(f"🚀 Numba-kompilerade trigger-regler: {len(entries)} triggers")
+            return vector_function, variable_order, [(entry[0], entry[3], entry[4]) for entry in entries]
+            
+        except Exception as e:
+            self.logger.warning(f"⚠️ Numba-kompilering misslyckades, använder Python-regler: {e}")
+            return None
     
     def evaluate_triggers(self, context_data: Dict) -> Dict[str, str]:
         """
@@ -240,47 +561,35 @@ class DynamicModuleManager:
             Exempel: {"bottom_section": "precipitation_active", "side_panel": "normal"}
         """
         try:
-            active_groups = {}
-            
-            # Börja med default groups (normal för alla sections)
-            for section_name, groups in self.module_groups.items():
-                if 'normal' in groups:
-                    active_groups[section_name] = 'normal'
-                else:
-                    # Använd första tillgängliga group som default
-                    first_group = list(groups.keys())[0] if groups else None
-                    if first_group:
-                        active_groups[section_name] = first_group
-            
-            # Evaluera triggers med priority-ordning (skippa kommentarer)
-            triggers_by_priority = sorted(
-                [(name, config) for name, config in self.triggers.items() 
-                 if not name.startswith('_') and isinstance(config, dict)],
-                key=lambda x: x[1].get('priority', 50),
-                reverse=True  # Högsta priority först
-            )
+            # Snabb väg: kör den kompilerade regel-funktionen
+            active_groups = self._run_compiled_ruleset(context_data, self._default_active_groups)
             
-            for trigger_name, trigger_config in triggers_by_priority:
-                try:
-                    condition = trigger_config.get('condition', '')
-                    target_section = trigger_config.get('target_section', '')
-                    activate_group = trigger_config.get('activate_group', '')
+            if active_groups is None:
+                # Börja med default groups (förberäknade i __init__)
+                active_groups = self._default_active_groups.copy()
+                
+                # Evaluera triggers med priority-ordning (förberäknad i __init__)
+                for trigger_name, trigger_config in self._sorted_triggers:
+                    try:
+                        condition = trigger_config.get('condition', '')
+                        target_section = trigger_config.get('target_section', '')
+                        activate_group = trigger_config.get('activate_group', '')
                     
-                    if not all([condition, target_section, activate_group]):
-                        self.logger.warning(f"⚠️ Ofullständig trigger config: {trigger_name}")
-                        continue
+                        if not all([condition, target_section, activate_group]):
+                            self.logger.warning(f"⚠️ Ofullständig trigger config: {trigger_name}")
+                            continue
                     
-                    # Evaluera condition
-                    if self.trigger_evaluator.evaluate_condition(condition, context_data):
-                        # Trigger är aktiv → aktivera group
-                        active_groups[target_section] = activate_group
-                        self.logger.info(f"🎯 Trigger aktiverad: {trigger_name} → {target_section}.{activate_group}")
-                    else:
-                        self.logger.debug(f"🎯 Trigger inaktiv: {trigger_name}")
+                        # Evaluera condition
+                        if self.trigger_evaluator.evaluate_condition(condition, context_data):
+                            # Trigger är aktiv → aktivera group
+                            active_groups[target_section] = activate_group
+                            self.logger.debug(f"🎯 Trigger aktiverad: {trigger_name} → {target_section}.{activate_group}")
+                        else:
+                            self.logger.debug(f"🎯 Trigger inaktiv: {trigger_name}")
                     
-                except Exception as e:
-                    self.logger.error(f"❌ Fel vid trigger evaluation: {trigger_name} - {e}")
-                    continue
+                    except Exception as e:
+                        self.logger.error(f"❌ Fel vid trigger evaluation: {trigger_name} - {e}")
+                        continue
             
             self.current_active_groups = active_groups
             self.last_trigger_evaluation = time.time()
@@ -292,6 +601,55 @@ class DynamicModuleManager:
             # Fallback: alla sections till normal
             return {section: 'normal' for section in self.module_groups.keys()}
     
+    def _run_compiled_ruleset(self, context_data: Dict, default_groups: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """
+        Evaluera alla triggers via den kompilerade regel-funktionen
+        
+        Returns:
+            Aktiva groups, eller None om trigger-loopen ska användas istället
+        """
+        if self._compiled_ruleset is None:
+            return None
+        
+        ruleset, variables, threshold_spec = self._compiled_ruleset
+        active_groups = default_groups.copy()
+        fired = []
+        
+        try:
+            values = self.trigger_evaluator.resolve_variables(variables, context_data)
+            
+            # Samma trigger-värden som förra gången → samma resultat
+            cache_key = tuple(values.values())
+            if cache_key == self._trigger_cache_key:
+                self.logger.debug("🎯 Trigger-resultat oförändrat (cache)")
+                return dict(self._trigger_cache_val)
+            
+            if self._numba_ruleset is not None:
+                vector_function, variable_order, vector_entries = self._numba_ruleset
+                outcomes = vector_function(np.array([float(values[var_name]) for var_name in variable_order]))
+                
+                for outcome, (trigger_name, target_section, activate_group) in zip(outcomes, vector_entries):
+                    if outcome:
+                        active_groups[target_section] = activate_group
+                        fired.append(trigger_name)
+            else:
+                threshold = self._evaluate_threshold_triggers(threshold_spec, values) if threshold_spec else ()
+                ruleset(active_groups, fired, threshold, **values)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Kompilerade trigger-regler misslyckades, använder trigger-loop: {e}")
+            return None
+        
+        # Per-frame diagnostik: bygg inte loggsträngarna om DEBUG är avstängt
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for trigger_name in fired:
+                trigger_config = self.triggers[trigger_name]
+                self.logger.debug(f"🎯 Trigger aktiverad: {trigger_name} → {trigger_config['target_section']}.{trigger_config['activate_group']}")
+        
+        self._trigger_cache_key = cache_key
+        self._trigger_cache_val = dict(active_groups)
+        
+        return active_groups
+    
     def get_active_modules(self, context_data: Dict) -> List[str]:
         """
         Returnera lista av moduler som ska renderas baserat på aktiva groups
@@ -304,8 +662,24 @@ class DynamicModuleManager:
         """
         try:
             # Evaluera triggers för att få aktiva groups
-            active_groups = self.evaluate_triggers(context_data)
+            return self._collect_modules(self.evaluate_triggers(context_data))
+            
+        except Exception as e:
+            self.logger.error(f"❌ Fel vid hämtning av aktiva moduler: {e}")
+            # Fallback: legacy modules
+            return [name for name, config in self.legacy_modules.items() if config.get('enabled', False)]
+    
+    def _collect_modules(self, active_groups: Dict[str, str]) -> List[str]:
+        """
+        Samla moduler från redan evaluerade groups
+        
+        Args:
+            active_groups: Dict section → aktiv group från evaluate_triggers
             
+        Returns:
+            Lista av modulnamn som ska renderas
+        """
+        try:
             active_modules = []
             
             # Samla moduler från aktiva groups
@@ -315,14 +689,16 @@ class DynamicModuleManager:
                     if active_group in section_groups:
                         group_modules = section_groups[active_group]
                         active_modules.extend(group_modules)
-                        self.logger.debug(f"📊 Section {section_name}: {active_group} → {group_modules}")
+                        if self.logger.isEnabledFor(logging.DEBUG):
+                            self.logger.debug(f"📊 Section {section_name}: {active_group} → {group_modules}")
             
             # Fallback: använd legacy modules om inga groups är definierade
             if not active_modules and self.legacy_modules:
                 active_modules = [name for name, config in self.legacy_modules.items() if isinstance(config, dict) and config.get('enabled', False)]
                 self.logger.info("🔄 Använder legacy modules (inga groups definierade)")
             
-            self.logger.info(f"🎯 Aktiva moduler: {active_modules}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"🎯 Aktiva moduler: {active_modules}")
             return active_modules
             
         except Exception as e:
@@ -341,11 +717,11 @@ class DynamicModuleManager:
             Dict med layout state information
         """
         active_groups = self.evaluate_triggers(context_data)
-        active_modules = self.get_active_modules(context_data)
+        active_modules = self._collect_modules(active_groups)
         
         return {
             'active_groups': active_groups,
-            'active_modules': active_modules,
+            'active_modules': frozenset(active_modules),  # Jämförs som mängd i should_layout_update
             'trigger_evaluation_time': self.last_trigger_evaluation
         }
     
@@ -372,7 +748,7 @@ class DynamicModuleManager:
             
             if last_groups != current_groups:
                 changes = []
-                for section in set(list(last_groups.keys()) + list(current_groups.keys())):
+                for section in last_groups.keys() | current_groups.keys():
                     last_group = last_groups.get(section, 'none')
                     current_group = current_groups.get(section, 'none')
                     if last_group != current_group:
@@ -380,9 +756,9 @@ class DynamicModuleManager:
                 
                 return True, f"Layout-ändring: {', '.join(changes)}"
             
-            # Jämför aktiva moduler
-            last_modules = set(last_layout_state.get('active_modules', []))
-            current_modules = set(current_layout_state.get('active_modules', []))
+            # Jämför aktiva moduler (lagras redan som frozenset)
+            last_modules = last_layout_state.get('active_modules', frozenset())
+            current_modules = current_layout_state.get('active_modules', frozenset())
             
             if last_modules != current_modules:
                 added = current_modules - last_modules
@@ -401,35 +777,38 @@ class DynamicModuleManager:
             self.logger.error(f"❌ Fel vid layout change detection: {e}")
             return True, f"Fel vid layout-kontroll: {e}"
     
-    def build_trigger_context(self, weather_data: Dict) -> Dict[str, Any]:
+    def build_trigger_context(self, snapshot: Dict, now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Bygg komplett context för trigger evaluation
         
         Args:
-            weather_data: Väderdata från weather_client
+            snapshot: Platt väderdata-snapshot (se EPaperWeatherDaemon.snapshot_weather_data)
+            now: Iterationens tidsstämpel (datetime.now() om den inte anges)
             
         Returns:
             Dict med all context data för triggers
         """
         try:
-            now = datetime.now()
+            now = now or datetime.now()
             
-            # Extrahera cykel-väder data om tillgängligt
-            cycling_weather = weather_data.get('cycling_weather', {})
+            def value(key, default):
+                found = snapshot.get(key)
+                return default if found is None else found
             
             context = {
                 # Väderdata
-                'precipitation': weather_data.get('precipitation', 0.0),
-                'forecast_precipitation_2h': cycling_weather.get('precipitation_mm', 0.0),  # Från cykel-väder analys
-                'temperature': weather_data.get('temperature', 20.0),
-                'wind_speed': weather_data.get('wind_speed', 0.0),
-                'pressure_trend_arrow': weather_data.get('pressure_trend_arrow', 'stable'),
+                'precipitation': value('precipitation', 0.0),
+                'forecast_precipitation_2h': value('forecast_precipitation_2h', 0.0),  # Från cykel-väder analys
+                'temperature': value('temperature', 20.0),
+                'wind_speed': value('wind_speed', 0.0),
+                'pressure_trend_arrow': value('pressure_trend_arrow', 'stable'),
                 
                 # Temporal context  
+                'current_time': now,
                 'time_hour': now.hour,
                 'time_month': now.month,
                 'time_weekday': now.weekday(),
-                'is_daylight': self._determine_daylight(weather_data),
+                'is_daylight': self._determine_daylight(snapshot, now),
                 
                 # User context (från config)
                 'user_preferences': self.config.get('user_preferences', {}),
@@ -439,36 +818,129 @@ class DynamicModuleManager:
                 'debug_mode': self.config.get('debug', {}).get('enabled', False)
             }
             
-            self.logger.debug(f"🌐 Trigger context: precipitation={context['precipitation']}, forecast_2h={context['forecast_precipitation_2h']}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"🌐 Trigger context: precipitation={context['precipitation']}, forecast_2h={context['forecast_precipitation_2h']}")
             return context
             
         except Exception as e:
             self.logger.error(f"❌ Fel vid context building: {e}")
             return {}
     
-    def _determine_daylight(self, weather_data: Dict) -> bool:
-        """Bestäm om det är dagsljus baserat på soldata"""
+    def _determine_daylight(self, snapshot: Dict, now: datetime) -> bool:
+        """Bestäm om det är dagsljus baserat på soldata vid tidpunkten now"""
         try:
-            sun_data = weather_data.get('sun_data', {})
-            sunrise_time = weather_data.get('parsed_sunrise')
-            sunset_time = weather_data.get('parsed_sunset')
+            sunrise_time = snapshot.get('parsed_sunrise')
+            sunset_time = snapshot.get('parsed_sunset')
             
             if sunrise_time and sunset_time:
-                now = datetime.now()
                 return sunrise_time <= now <= sunset_time
             else:
                 # Fallback: 06:00-18:00 = dagsljus
-                hour = datetime.now().hour
-                return 6 <= hour <= 18
+                return 6 <= now.hour <= 18
                 
         except Exception as e:
             self.logger.warning(f"⚠️ Fel vid dagsljus-bestämning: {e}")
             return True  # Default till dagsljus
 
 
+class ArrayBorderDraw:
+    """
+    Minimal ImageDraw-ersättare för modulramar som skriver direkt i en NumPy-array
+    
+    Ramar består bara av horisontella/vertikala linjer och rektangel-konturer, som blir
+    rad-/kolumn-slices istället för Pillows generella linjeritning. Pixelresultatet är
+    detsamma som ImageDraw.line/rectangle ger för axelparallella streck.
+    """
+    
+    def __init__(self, array):
+        self.array = array
+    
+    def _hline(self, y, x0, x1, width=1):
+        """Horisontell linje: width rader centrerade kring y (som Pillow)"""
+        top = max(y - (width - 1) // 2, 0)
+        self.array[top:y - (width - 1) // 2 + width, max(min(x0, x1), 0):max(x0, x1) + 1] = 0
+    
+    def _vline(self, x, y0, y1, width=1):
+        """Vertikal linje: width kolumner centrerade kring x (som Pillow)"""
+        left = max(x - (width - 1) // 2, 0)
+        self.array[max(min(y0, y1), 0):max(y0, y1) + 1, left:x - (width - 1) // 2 + width] = 0
+    
+    def _rect_outline(self, x0, y0, x1, y1, width=1):
+        """Rektangel-kontur: width pixlar inåt från kanterna (som Pillow)"""
+        for i in range(width):
+            self._hline(y0 + i, x0, x1)
+            self._hline(y1 - i, x0, x1)
+            self._vline(x0 + i, y0, y1)
+            self._vline(x1 - i, y0, y1)
+    
+    def line(self, xy, fill=0, width=1):
+        (x0, y0), (x1, y1) = xy
+        if y0 == y1:
+            self._hline(y0, x0, x1, width)
+        elif x0 == x1:
+            self._vline(x0, y0, y1, width)
+        else:
+            raise ValueError("ArrayBorderDraw stöder bara axelparallella linjer")
+    
+    def rectangle(self, xy, outline=0, width=1):
+        (x0, y0), (x1, y1) = xy
+        self._rect_outline(x0, y0, x1, y1, width)
+
+
+class BorderDisplayList:
+    """
+    Spelar in ritanrop från draw_module_border som (metod, xy, kwargs)
+    
+    Modulramens if/elif-kedja körs då en gång per modul; listan spelas sedan upp
+    mot ImageDraw eller ArrayBorderDraw när ett ramlager renderas.
+    """
+    
+    def __init__(self):
+        self.ops = []
+    
+    def line(self, xy, **kwargs):
+        self.ops.append(('line', xy, kwargs))
+    
+    def rectangle(self, xy, **kwargs):
+        self.ops.append(('rectangle', xy, kwargs))
+
+
 class EPaperWeatherDaemon:
     """E-Paper Weather Daemon - Kontinuerlig väderstation med DYNAMIC MODULE SYSTEM + RENDERING PIPELINE"""
     
+    # Fält som jämförs mellan ticks - delas med main.py (se modules/display_spec.py)
+    # Skala 10 = jämför avrundat till tiondelar som heltal, None = exakt jämförelse
+    COMPARE_SPEC = COMPARE_SPEC
+    
+    # Fält som legacy renderers läser: (nyckel, tillåtna typer, default vid saknat/felaktigt värde)
+    RENDER_SPEC = (
+        ('temperature', (int, float), 20.0),
+        ('weather_description', str, 'Okänt väder'),
+        ('temperature_source', str, 'fallback'),
+        ('location', str, 'Okänd plats'),
+        ('weather_symbol', (int, float), 1),
+        ('parsed_sun_data', dict, {}),
+        ('pressure', (int, float), 1013),
+        ('pressure_source', str, 'unknown'),
+        ('pressure_trend', dict, {}),
+        ('pressure_trend_text', str, 'Samlar data'),
+        ('pressure_trend_arrow', str, 'stable'),
+        ('tomorrow', dict, {}),
+    )
+    
+    # Samma för weather_data['tomorrow']
+    TOMORROW_RENDER_SPEC = (
+        ('temperature', (int, float), 18.0),
+        ('weather_description', str, 'Okänt'),
+        ('weather_symbol', (int, float), 3),
+    )
+    
+    # Moduler med ren svart/vit text som klarar partial refresh utan synligt ghosting
+    PARTIAL_REFRESH_MODULES = frozenset({'clock_module', 'status_module'})
+    
+    # Full refresh efter så här många partial refreshes i rad (rensar ghosting)
+    PARTIAL_REFRESH_LIMIT = 10
+    
     def __init__(self, config_path="config.json"):
         """Initialisera daemon med Dynamic Module System + Rendering Pipeline"""
         print("🌤️ E-Paper Weather Daemon - Startar med PRECIPITATION FIX...")
@@ -483,6 +955,18 @@ class EPaperWeatherDaemon:
         self.current_layout_state = None   # Layout state tracking
         self.last_update_time = 0
         
+        # Senast skickade frame: hash av canvas-bytes + tidpunkt (för att hoppa över identiska)
+        self._last_frame_hash = None
+        self._last_frame_time = 0
+        
+        # Senast skickade canvas + antal partial refreshes sedan senaste fulla
+        self._last_frame = None
+        self._partial_refreshes = 0
+        
+        # Cache för parsade soltider: (sunrise_str, sunset_str) → (sunrise, sunset)
+        self._sun_cache_key = None
+        self._sun_cache_val = None
+        
         # Ladda konfiguration
         self.config = self.load_config(config_path)
         if not self.config:
@@ -501,23 +985,81 @@ class EPaperWeatherDaemon:
         # Ladda typsnitt FÖRST (behövs av ModuleFactory)
         self.fonts = self.load_fonts()
         
+        # Förladda ikoner som renderingen använder (ikon-cachen blir en ren dict-lookup)
+        self.preload_icons()
+        
         # NYT: Module Factory för rendering pipeline
         self.module_factory = ModuleFactory(self.icon_manager, self.fonts)
         
+        # Mapping från modulnamn till legacy render-metoder - byggs en gång
+        self._legacy_renderers = {
+            'main_weather': self.legacy_render_main_weather,
+            'barometer_module': self.legacy_render_barometer,
+            'tomorrow_forecast': self.legacy_render_tomorrow_forecast,
+            'clock_module': self.legacy_render_clock,
+            'status_module': self.legacy_render_status
+        }
+        
         # Initialisera E-Paper display
         self.epd = None
         self.init_display()
         
+        # Display-tråd: SPI-överföring + panel-refresh överlappar nästa hämtning/rendering.
+        # En plats i kön - en väntande frame ersätts av nyare
+        # Med display.sleep_between_updates sövs panelen efter varje frame och väcks med init()
+        self._sleep_between_frames = self.config['display'].get('sleep_between_updates', False)
+        self._panel_asleep = False
+        self._display_queue = queue.Queue(maxsize=1)
+        self._display_thread = threading.Thread(target=self._display_worker, name='epd-display', daemon=True)
+        self._display_thread.start()
+        
         # Canvas setup
         self.width = self.config['layout']['screen_width']
         self.height = self.config['layout']['screen_height']
         self.canvas = Image.new('1', (self.width, self.height), 255)
         self.draw = ImageDraw.Draw(self.canvas)
         
+        # Förallokerad vit bakgrund - rensning blir en paste av färdig buffer
+        self._blank_canvas = Image.new('1', (self.width, self.height), 255)
+        
+        # Modulernas rektanglar (x, y, width, height) - läses ur nästlad config en gång
+        self._module_rects = {
+            name: (module_config['coords']['x'], module_config['coords']['y'],
+                   module_config['size']['width'], module_config['size']['height'])
+            for name, module_config in self.config['modules'].items()
+            if isinstance(module_config, dict) and 'coords' in module_config and 'size' in module_config
+        }
+        
+        # Ramarnas ritanrop per modul - draw_module_border utvärderas en gång här
+        self._border_ops = {}
+        for module_name, rect in self._module_rects.items():
+            recorder = BorderDisplayList()
+            self.draw_module_border(*rect, module_name, draw=recorder)
+            self._border_ops[module_name] = tuple(recorder.ops)
+        
+        # Förrenderade ramlager per uppsättning aktiva moduler (layouten är statisk i config)
+        self._border_layers = {}
+        
+        # Sprites för status-prickar: ('dot', size) → mask
+        self._sprites = {}
+        
+        # Rastrerade textmasker per (text, font) - värden som "1013" och "13:37" återkommer
+        self._text_sprite = lru_cache(maxsize=512)(self._rasterize_text)
+        
+        # Memoiserad textbredd per (text, font) - samma strängar mäts om varje rendering
+        self._text_width = lru_cache(maxsize=1024)(self._measure_text_width)
+        
+        # Väcker huvudloopen före update_interval (shutdown eller SIGUSR1)
+        self._wake = threading.Event()
+        
         # Setup signal handlers för graceful shutdown
         signal.signal(signal.SIGTERM, self.signal_handler)
         signal.signal(signal.SIGINT, self.signal_handler)
         
+        # SIGUSR1: hämta och jämför väderdata direkt (t.ex. `kill -USR1 <pid>`)
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.wake_handler)
+        
         self.logger.info("🌤️ E-Paper Weather Daemon initialiserad med PRECIPITATION FIX")
         self.logger.info("🎨 Precipitation module använder nu PrecipitationRenderer via ModuleFactory")
         self.logger.info("📅 FIXAD: Månadsnamn problem löst med korta månadsnamn")
@@ -526,6 +1068,12 @@ class EPaperWeatherDaemon:
         """Hantera shutdown signals"""
         self.logger.info(f"📶 Signal {signum} mottagen - avslutar daemon...")
         self.running = False
+        self._wake.set()
+    
+    def wake_handler(self, signum, frame):
+        """Hantera SIGUSR1 - väck huvudloopen för omedelbar uppdateringskontroll"""
+        self.logger.info(f"📶 Signal {signum} mottagen - kontrollerar uppdatering direkt")
+        self._wake.set()
     
     def load_config(self, config_path):
         """Ladda JSON-konfiguration"""
@@ -560,13 +1108,32 @@ class EPaperWeatherDaemon:
             self.logger.info("📱 Initialiserar E-Paper display för daemon...")
             self.epd = epd4in26.EPD()
             self.epd.init()
-            self.epd.Clear()
+            # Clear() bara första gången efter reboot - annars visas första frame ändå med full refresh
+            self.clear_on_first_boot()
             self.logger.info("✅ E-Paper display redo för daemon")
         except Exception as e:
             self.logger.error(f"❌ E-Paper display-fel: {e}")
             if not self.config['debug']['test_mode']:
                 sys.exit(1)
     
+    def clear_on_first_boot(self):
+        """
+        Rensa panelen (full Clear) en gång per boot
+        
+        Marker-filen ligger i /tmp och försvinner vid reboot, så daemon-start efter reboot
+        rensar eventuella spökbilder medan omstarter (restart.py) hoppar över det.
+        Delas med main.py - bara en av dem rensar.
+        """
+        marker_file = "/tmp/epaper_panel_cleared"
+        if os.path.exists(marker_file):
+            return
+        
+        self.logger.info("🧹 Första start efter reboot - rensar E-Paper display")
+        self.epd.Clear()
+        
+        with open(marker_file, 'w') as f:
+            f.write(f"Panel cleared at {datetime.now().strftime('%Y%m%d_%H%M%S')}\n")
+    
     def load_fonts(self):
         """Ladda typsnitt"""
         fonts = {}
@@ -584,27 +1151,37 @@ class EPaperWeatherDaemon:
         
         return fonts
     
-    def should_update_display(self, weather_data: Dict) -> tuple:
+    def preload_icons(self):
+        """Ladda och E-Paper-optimera alla ikoner legacy-modulerna använder, i deras storlekar"""
+        try:
+            self.icon_manager.preload_weather_icons((96, 96))                       # Hero dag/natt
+            self.icon_manager.preload_weather_icons((80, 80), include_night=False)  # Imorgon
+            
+            for sun_type in ('sunrise', 'sunset'):
+                self.icon_manager.get_sun_icon(sun_type, size=(56, 56))
+            for trend in ('rising', 'falling', 'stable'):
+                self.icon_manager.get_pressure_icon(trend, size=(64, 64))
+            
+            self.icon_manager.get_system_icon('barometer', size=(80, 80))
+            self.icon_manager.get_system_icon('calendar', size=(40, 40))
+            
+            self.logger.info(f"🎨 Ikoner förladdade: {self.icon_manager.get_cache_stats()['total_cached_icons']} i cache")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Kunde inte förladda ikoner: {e}")
+    
+    def should_update_display(self, snapshot: Dict, now: Optional[datetime] = None) -> tuple:
         """
         DAEMON STATE JÄMFÖRELSE + LAYOUT CHANGE DETECTION
         Samma logik som original men UTÖKAT med Dynamic Module System
         
         Args:
-            weather_data: Ny väderdata
+            snapshot: Platt snapshot av ny väderdata (från snapshot_weather_data)
+            now: Iterationens tidsstämpel (datetime.now() om den inte anges)
             
         Returns:
             Tuple (should_update: bool, reason: str)
         """
         try:
-            # NYT: Kontrollera layout-ändringar FÖRST (högsta prioritet)
-            trigger_context = self.module_manager.build_trigger_context(weather_data)
-            layout_changed, layout_reason = self.module_manager.should_layout_update(
-                trigger_context, self.current_layout_state
-            )
-            
-            if layout_changed:
-                return True, f"LAYOUT: {layout_reason}"
-            
             # BEFINTLIG LOGIK: Första körningen
             if self.current_display_state is None:
                 return True, "Daemon första körning"
@@ -615,39 +1192,44 @@ class EPaperWeatherDaemon:
                 return True, f"30-min watchdog ({time_since_last/60:.1f} min)"
             
             # BEFINTLIG LOGIK: Datum-ändring
-            current_date = datetime.now().strftime('%Y-%m-%d')
+            now = now or datetime.now()
+            current_date = now.strftime('%Y-%m-%d')
             last_date = self.current_display_state.get('date', '')
             if current_date != last_date:
                 return True, f"Nytt datum: {last_date} → {current_date}"
             
-            # BEFINTLIG LOGIK: Väderdata-jämförelse
-            comparisons = [
-                ('temperature', weather_data.get('temperature'), 'Temperatur'),
-                ('weather_symbol', weather_data.get('weather_symbol'), 'Väderikon'),
-                ('weather_description', weather_data.get('weather_description'), 'Väderbeskrivning'),
-                ('pressure', weather_data.get('pressure'), 'Lufttryck'),
-                ('pressure_trend_text', weather_data.get('pressure_trend_text'), 'Trycktrend text'),
-                ('pressure_trend_arrow', weather_data.get('pressure_trend_arrow'), 'Trycktrend pil'),
-                ('tomorrow_temp', weather_data.get('tomorrow', {}).get('temperature'), 'Imorgon temperatur'),
-                ('tomorrow_symbol', weather_data.get('tomorrow', {}).get('weather_symbol'), 'Imorgon väderikon'),
-                ('tomorrow_desc', weather_data.get('tomorrow', {}).get('weather_description'), 'Imorgon beskrivning'),
-                ('sunrise', weather_data.get('sun_data', {}).get('sunrise'), 'Soluppgång'),
-                ('sunset', weather_data.get('sun_data', {}).get('sunset'), 'Solnedgång'),
-            ]
+            # Väderdata: en digest över COMPARE_SPEC-fälten - fältloopen körs bara vid skillnad
+            # och då enbart för att ta fram en läsbar anledning
+            if compare_digest(snapshot) == self.current_display_state.get('digest'):
+                fields_to_check = ()
+            else:
+                fields_to_check = self.COMPARE_SPEC
             
-            for key, current_value, description in comparisons:
+            for key, _, scale, description in fields_to_check:
+                current_value = snapshot.get(key)
                 last_value = self.current_display_state.get(key)
                 
-                # Numeriska värden med tolerans
-                if key in ['temperature', 'pressure', 'tomorrow_temp']:
-                    if current_value is not None and last_value is not None:
-                        if abs(float(current_value) - float(last_value)) >= 0.1:
+                # Numeriska värden: jämför förskalade heltal (t.ex. tiondelar)
+                if scale is not None:
+                    last_scaled = self.current_display_state.get(f'{key}_{scale}')
+                    if current_value is not None and last_scaled is not None:
+                        if int(round(float(current_value) * scale)) != last_scaled:
                             return True, f"{description}: {last_value} → {current_value}"
                 else:
                     # Exakt jämförelse för strängar och heltal
                     if current_value != last_value:
                         return True, f"{description}: {last_value} → {current_value}"
             
+            # Layout-ändringar SIST: trigger-evaluering behövs bara när inget billigare test
+            # redan har begärt omritning (update_state räknar om layout state efter rendering)
+            trigger_context = self.module_manager.build_trigger_context(snapshot, now)
+            layout_changed, layout_reason = self.module_manager.should_layout_update(
+                trigger_context, self.current_layout_state
+            )
+            
+            if layout_changed:
+                return True, f"LAYOUT: {layout_reason}"
+            
             # INGEN FÖRÄNDRING
             return False, "Inga förändringar"
             
@@ -655,8 +1237,55 @@ class EPaperWeatherDaemon:
             self.logger.error(f"❌ Fel vid jämförelse: {e}")
             return True, f"Fel vid jämförelse: {e}"
     
-    def fetch_weather_data(self) -> Dict:
-        """Hämta väderdata (samma som original)"""
+    def snapshot_weather_data(self, weather_data: Dict) -> Dict[str, Any]:
+        """
+        Platta ut de väderfält som jämförs och används av triggers
+        
+        Byggs en gång per hämtning så att should_update_display, build_trigger_context
+        och update_state slipper gå igenom weather_data var för sig.
+        
+        Args:
+            weather_data: Väderdata från fetch_weather_data
+            
+        Returns:
+            Dict med COMPARE_SPEC-fälten samt trigger-fälten (None om fält saknas)
+        """
+        snapshot = extract_compare_values(weather_data)
+        snapshot['precipitation'] = weather_data.get('precipitation')
+        snapshot['forecast_precipitation_2h'] = get_path(weather_data, ('cycling_weather', 'precipitation_mm'))
+        snapshot['wind_speed'] = weather_data.get('wind_speed')
+        snapshot['parsed_sunrise'] = weather_data.get('parsed_sunrise')
+        snapshot['parsed_sunset'] = weather_data.get('parsed_sunset')
+        return snapshot
+    
+    @staticmethod
+    def _apply_render_spec(data: Dict, spec) -> Dict[str, Any]:
+        """Kopiera data med spec-fälten typkontrollerade (default om saknas eller fel typ)"""
+        validated = dict(data)
+        for key, types, default in spec:
+            if not isinstance(validated.get(key), types):
+                validated[key] = default
+        return validated
+    
+    def validate_weather_data(self, weather_data: Dict) -> Dict[str, Any]:
+        """
+        Validera weather_data en gång per rendering
+        
+        Legacy renderers kan sedan läsa fälten direkt (weather_data['pressure'])
+        utan egna defaults - även None från en API-källa ersätts med default.
+        
+        Args:
+            weather_data: Väderdata från fetch_weather_data
+            
+        Returns:
+            Kopia av weather_data där RENDER_SPEC-fälten har rätt typ
+        """
+        validated = self._apply_render_spec(weather_data, self.RENDER_SPEC)
+        validated['tomorrow'] = self._apply_render_spec(validated['tomorrow'], self.TOMORROW_RENDER_SPEC)
+        return validated
+    
+    def fetch_weather_data(self) -> tuple:
+        """Hämta väderdata (samma som original) samt dess snapshot"""
         try:
             self.logger.debug("🌐 Hämtar väderdata från Netatmo + SMHI + exakta soltider...")
             
@@ -671,18 +1300,18 @@ class EPaperWeatherDaemon:
             weather_data['parsed_sunset'] = sunset
             weather_data['parsed_sun_data'] = sun_data
             
-            return weather_data
-            
         except Exception as e:
             self.logger.error(f"❌ Fel vid hämtning av väderdata: {e}")
             # Returnera fallback-data
-            return {
+            weather_data = {
                 'temperature': 20.0,
                 'weather_description': 'Data ej tillgänglig',
                 'pressure': 1013,
                 'location': 'Okänd plats',
                 'data_sources': ['fallback']
             }
+        
+        return weather_data, self.snapshot_weather_data(weather_data)
     
     def parse_sun_data_from_weather(self, weather_data: Dict) -> tuple:
         """Parsea soldata (kopierat från original)"""
@@ -707,10 +1336,17 @@ class EPaperWeatherDaemon:
                 sunrise_str = sun_data.get('sunrise')
                 sunset_str = sun_data.get('sunset')
                 
-                if sunrise_str and sunset_str:
+                sun_key = (sunrise_str, sunset_str)
+                
+                if sun_key == self._sun_cache_key:
+                    # Soltiderna ändras bara ett par gånger per dygn - återanvänd parsning
+                    sunrise_time, sunset_time = self._sun_cache_val
+                elif sunrise_str and sunset_str:
                     try:
                         sunrise_time = datetime.fromisoformat(sunrise_str.replace('Z', '+00:00'))
                         sunset_time = datetime.fromisoformat(sunset_str.replace('Z', '+00:00'))
+                        self._sun_cache_key = sun_key
+                        self._sun_cache_val = (sunrise_time, sunset_time)
                     except:
                         # Fallback
                         now = datetime.now()
@@ -730,7 +1366,9 @@ class EPaperWeatherDaemon:
                 'source': sun_data.get('sun_source', 'unknown')
             }
             
-            self.logger.info(f"☀️ Soldata parsead: {sunrise_time.strftime('%H:%M')} - {sunset_time.strftime('%H:%M')} (källa: {parsed_sun_data['source']})")
+            # Körs varje wake (var 60:e sekund) - strftime-strängarna byggs bara vid DEBUG
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"☀️ Soldata parsead: {sunrise_time.strftime('%H:%M')} - {sunset_time.strftime('%H:%M')} (källa: {parsed_sun_data['source']})")
             
             return sunrise_time, sunset_time, parsed_sun_data
             
@@ -742,34 +1380,34 @@ class EPaperWeatherDaemon:
             sunset = now.replace(hour=18, minute=0, second=0)
             return sunrise, sunset, {'sunrise': sunrise.isoformat(), 'sunset': sunset.isoformat(), 'source': 'error_fallback'}
     
-    def render_and_display(self, weather_data: Dict):
+    def render_and_display(self, weather_data: Dict, snapshot: Dict, now: Optional[datetime] = None):
         """NYT: Rendera och visa på E-Paper display med MODULE RENDERING PIPELINE"""
         try:
             self.logger.info("🎨 Renderar ny layout med Module Rendering Pipeline...")
             
-            # Bygg trigger context
-            trigger_context = self.module_manager.build_trigger_context(weather_data)
+            # Bygg trigger context (bär även iterationens tidsstämpel till renderers)
+            trigger_context = self.module_manager.build_trigger_context(snapshot, now)
             
             # Hämta aktiva moduler från Dynamic Module Manager
             active_modules = self.module_manager.get_active_modules(trigger_context)
             
-            # FULLSTÄNDIG RENDERING med nya pipeline
-            self.clear_canvas()
+            # Renderers läser aktiva moduler ur context istället för att evaluera triggers igen
+            trigger_context['active_modules'] = active_modules
             
-            # NYT: Rendera moduler via Module Factory + Renderer Pipeline
             for module_name in active_modules:
-                if module_name not in self.config['modules']:
+                if module_name not in self._module_rects:
                     self.logger.warning(f"⚠️ Okänd modul: {module_name}")
-                    continue
-                
-                module_config = self.config['modules'][module_name]
-                x = module_config['coords']['x']
-                y = module_config['coords']['y'] 
-                width = module_config['size']['width']
-                height = module_config['size']['height']
-                
-                # Rita modulram (behålls från original)
-                self.draw_module_border(x, y, width, height, module_name)
+            active_modules = [name for name in active_modules if name in self._module_rects]
+            
+            # Validera väderdata en gång istället för defaults i varje renderer
+            weather_data = self.validate_weather_data(weather_data)
+            
+            # FULLSTÄNDIG RENDERING med nya pipeline: vit bakgrund + alla modulramar i ett svep
+            self.clear_canvas(active_modules)
+            
+            # NYT: Rendera moduler via Module Factory + Renderer Pipeline
+            for module_name in active_modules:
+                x, y, width, height = self._module_rects[module_name]
                 
                 # NYT: Factory-baserad rendering
                 success = self.render_module_via_factory(
@@ -781,8 +1419,7 @@ class EPaperWeatherDaemon:
             
             # Visa på display
             if self.epd and not self.config['debug']['test_mode']:
-                self.epd.display(self.epd.getbuffer(self.canvas))
-                self.logger.info("✅ E-Paper display uppdaterad med Module Rendering Pipeline")
+                self.push_frame(active_modules)
             else:
                 self.logger.info("🧪 Test-läge: Display simulering")
             
@@ -790,6 +1427,127 @@ class EPaperWeatherDaemon:
             self.logger.error(f"❌ Fel vid rendering: {e}")
             raise
     
+    def push_frame(self, active_modules: List[str]):
+        """
+        Skicka canvas till E-Paper - hoppar över SPI-överföring och panel-refresh
+        om pixlarna är identiska med förra skickade frame
+        
+        En identisk frame skickas ändå efter watchdog-intervallet så panelen
+        friskas upp regelbundet. Om bara text-moduler (PARTIAL_REFRESH_MODULES)
+        har ändrats används panelens partial refresh istället för full refresh.
+        
+        Args:
+            active_modules: Moduler som renderades i denna frame
+        """
+        frame_bytes = self.canvas.tobytes()
+        frame_hash = hashlib.blake2b(frame_bytes, digest_size=8).digest()
+        frame_age = time.time() - self._last_frame_time
+        
+        if frame_hash == self._last_frame_hash and frame_age < self.watchdog_interval:
+            self.logger.info("💤 Identisk frame - hoppar över E-Paper refresh")
+            return
+        
+        buffer = self.get_frame_buffer(frame_bytes)
+        dirty_modules = self.get_dirty_modules(active_modules)
+        display_partial = getattr(self.epd, 'display_Partial', None)
+        
+        # En frame som ersätter en ej visad frame måste visas fullt - panelens
+        # referensbild för partial refresh är då inte den vi jämförde mot
+        try:
+            self._display_queue.get_nowait()
+            self._display_queue.task_done()
+            dirty_modules = None
+            self.logger.debug("🗑️ Ej visad frame ersatt av nyare")
+        except queue.Empty:
+            pass
+        
+        # Panelens RAM (referensbilden) finns inte kvar efter deep sleep
+        if self._sleep_between_frames:
+            dirty_modules = None
+        
+        if (display_partial and dirty_modules is not None
+                and dirty_modules <= self.PARTIAL_REFRESH_MODULES
+                and self._partial_refreshes < self.PARTIAL_REFRESH_LIMIT):
+            self._display_queue.put_nowait((display_partial, buffer, f"partial refresh: {sorted(dirty_modules)}"))
+            self._partial_refreshes += 1
+        else:
+            # display_Base sätter även panelens referensbild som partial refresh jämför mot
+            display_full = getattr(self.epd, 'display_Base', None) if display_partial else None
+            self._display_queue.put_nowait((display_full or self.epd.display, buffer, "full refresh"))
+            self._partial_refreshes = 0
+        
+        self._last_frame = self.canvas.copy()
+        self._last_frame_hash = frame_hash
+        self._last_frame_time = time.time()
+    
+    def _display_worker(self):
+        """Display-tråd: visa frames från kön tills None (shutdown) tas emot"""
+        while True:
+            frame = self._display_queue.get()
+            try:
+                if frame is None:
+                    return
+                
+                display_func, buffer, description = frame
+                if self._panel_asleep:
+                    self.epd.init()
+                    self._panel_asleep = False
+                
+                display_func(buffer)
+                self.logger.info(f"✅ E-Paper display uppdaterad med Module Rendering Pipeline ({description})")
+                
+                # Söv panelen om ingen ny frame väntar
+                if self._sleep_between_frames and self._display_queue.empty():
+                    self.epd.sleep()
+                    self._panel_asleep = True
+                
+            except Exception as e:
+                self.logger.error(f"❌ Fel vid E-Paper display: {e}")
+            finally:
+                self._display_queue.task_done()
+    
+    def get_frame_buffer(self, frame_bytes: bytes) -> bytearray:
+        """
+        Displaybuffer för canvas utan att gå via epd.getbuffer när det går
+        
+        Canvas är redan 1-bit (mode '1'), och Pillows råformat för det är exakt panelens
+        packade format: 8 pixlar per byte, MSB först, 1 = vit. Har panelen samma
+        orientering som canvas kan bytes skickas direkt; annars roterar getbuffer.
+        """
+        if (getattr(self.epd, 'width', None), getattr(self.epd, 'height', None)) == self.canvas.size:
+            return bytearray(frame_bytes)
+        return self.epd.getbuffer(self.canvas)
+    
+    def get_dirty_modules(self, active_modules: List[str]) -> Optional[frozenset]:
+        """
+        Jämför canvas med senast skickade frame och returnera moduler vars pixlar ändrats
+        
+        Returns:
+            Frozenset med ändrade moduler, eller None om jämförelse inte är möjlig
+            (första frame, eller ändringar utanför modulerna, t.ex. ny layout)
+        """
+        if self._last_frame is None:
+            return None
+        
+        diff = ImageChops.difference(self._last_frame, self.canvas)
+        if diff.getbbox() is None:
+            return frozenset()
+        
+        dirty = set()
+        remaining = diff.copy()
+        for module_name in active_modules:
+            x, y, width, height = self._module_rects[module_name]
+            box = (x, y, x + width + 1, y + height + 1)
+            if diff.crop(box).getbbox() is not None:
+                dirty.add(module_name)
+                remaining.paste(0, box)
+        
+        # Ändringar som ingen modul täcker (t.ex. borttagna ramar) kräver full refresh
+        if remaining.getbbox() is not None:
+            return None
+        
+        return frozenset(dirty)
+    
     def render_module_via_factory(self, module_name: str, x: int, y: int, width: int, height: int,
                                   weather_data: Dict, trigger_context: Dict) -> bool:
         """
@@ -818,7 +1576,7 @@ class EPaperWeatherDaemon:
             success = renderer.render(x, y, width, height, weather_data, trigger_context)
             
             if success:
-                self.logger.info(f"✅ Modul {module_name} renderad via {renderer.__class__.__name__}")
+                self.logger.debug(f"✅ Modul {module_name} renderad via {renderer.__class__.__name__}")
             else:
                 self.logger.warning(f"⚠️ Rendering misslyckades för {module_name}")
             
@@ -838,49 +1596,45 @@ class EPaperWeatherDaemon:
         Returns:
             Funktion för legacy rendering eller None
         """
-        # Mapping från modulnamn till legacy render-metoder
-        legacy_mapping = {
-            'main_weather': self.legacy_render_main_weather,
-            'barometer_module': self.legacy_render_barometer,
-            'tomorrow_forecast': self.legacy_render_tomorrow_forecast,
-            'clock_module': self.legacy_render_clock,
-            'status_module': self.legacy_render_status
-        }
-        
-        return legacy_mapping.get(module_name)
+        return self._legacy_renderers.get(module_name)
     
     # === LEGACY RENDER FUNCTIONS (kopierade från original) ===
     
     def legacy_render_main_weather(self, x, y, width, height, weather_data, trigger_context):
         """BEFINTLIG: Hero-modul rendering (oförändrad från original)"""
-        temp = weather_data.get('temperature', 20.0)
-        desc = weather_data.get('weather_description', 'Okänt väder')
-        temp_source = weather_data.get('temperature_source', 'fallback')
-        location = weather_data.get('location', 'Okänd plats')
-        smhi_symbol = weather_data.get('weather_symbol', 1)
-        sun_data = weather_data.get('parsed_sun_data', {})
-        current_time = datetime.now()
+        temp = weather_data['temperature']
+        desc = weather_data['weather_description']
+        temp_source = weather_data['temperature_source']
+        location = weather_data['location']
+        smhi_symbol = weather_data['weather_symbol']
+        sun_data = weather_data['parsed_sun_data']
+        current_time = trigger_context.get('current_time') or datetime.now()
         
         # Plats överst i hero-modulen
-        self.draw.text((x + 20, y + 15), location, font=self.fonts['medium_desc'], fill=0)
+        self.draw_text((x + 20, y + 15), location, 'medium_desc')
         
         # VÄDERIKON med exakt dag/natt-logik - VERKLIG HÖGUPPLÖST STORLEK (96x96)
+        # Dag/natt via icon_manager (samma fallback som tidigare); redan parsade soltider
+        # skickas som datetime så ISO-strängarna inte parsas om varje frame
+        icon_sun_times = sun_data
+        if weather_data.get('parsed_sunrise') and weather_data.get('parsed_sunset'):
+            icon_sun_times = {'sunrise': weather_data['parsed_sunrise'], 'sunset': weather_data['parsed_sunset']}
         weather_icon = self.icon_manager.get_weather_icon_for_time(
-            smhi_symbol, current_time, sun_data, size=(96, 96)
+            smhi_symbol, current_time, icon_sun_times, size=(96, 96)
         )
         if weather_icon:
             # Placera ikon till höger om temperaturen - justerad position för 96x96
             icon_x = x + 320
             icon_y = y + 50
             self.paste_icon_on_canvas(weather_icon, icon_x, icon_y)
-            self.logger.info(f"🎨 HERO väderikon: 96x96 SVG-baserad (symbol {smhi_symbol})")
+            self.logger.debug(f"🎨 HERO väderikon: 96x96 SVG-baserad (symbol {smhi_symbol})")
         
         # TEMPERATUR (prioriterat från Netatmo!)
-        self.draw.text((x + 20, y + 60), f"{temp:.1f}°", font=self.fonts['hero_temp'], fill=0)
+        self.draw_text((x + 20, y + 60), f"{temp:.1f}°", 'hero_temp')
         
         # Beskrivning (från SMHI meteorologi)
         desc_truncated = self.truncate_text(desc, self.fonts['hero_desc'], width - 40)
-        self.draw.text((x + 20, y + 150), desc_truncated, font=self.fonts['hero_desc'], fill=0)
+        self.draw_text((x + 20, y + 150), desc_truncated, 'hero_desc')
         
         # Visa temperatur-källa
         if temp_source == 'netatmo':
@@ -890,7 +1644,7 @@ class EPaperWeatherDaemon:
         else:
             source_text = f"({temp_source.upper()})"
         
-        self.draw.text((x + 20, y + 185), source_text, font=self.fonts['tiny'], fill=0)
+        self.draw_text((x + 20, y + 185), source_text, 'tiny')
         
         # EXAKTA SOL-IKONER + tider - HÖGUPPLÖST STORLEK (56x56)
         sunrise = weather_data.get('parsed_sunrise')
@@ -904,17 +1658,17 @@ class EPaperWeatherDaemon:
             sunrise_icon = self.icon_manager.get_sun_icon('sunrise', size=(56, 56))
             if sunrise_icon:
                 self.paste_icon_on_canvas(sunrise_icon, x + 20, y + 200)
-                self.draw.text((x + 80, y + 215), sunrise_str, font=self.fonts['medium_desc'], fill=0)
+                self.draw_text((x + 80, y + 215), sunrise_str, 'medium_desc')
             else:
-                self.draw.text((x + 20, y + 215), f"🌅 {sunrise_str}", font=self.fonts['medium_desc'], fill=0)
+                self.draw_text((x + 20, y + 215), f"🌅 {sunrise_str}", 'medium_desc')
             
             # Solnedgång - ikon + exakt tid  
             sunset_icon = self.icon_manager.get_sun_icon('sunset', size=(56, 56))
             if sunset_icon:
                 self.paste_icon_on_canvas(sunset_icon, x + 180, y + 200)
-                self.draw.text((x + 240, y + 215), sunset_str, font=self.fonts['medium_desc'], fill=0)
+                self.draw_text((x + 240, y + 215), sunset_str, 'medium_desc')
             else:
-                self.draw.text((x + 180, y + 215), f"🌇 {sunset_str}", font=self.fonts['medium_desc'], fill=0)
+                self.draw_text((x + 180, y + 215), f"🌇 {sunset_str}", 'medium_desc')
         
         # Visa soldata-källa (diskret)
         sun_source = sun_data.get('source', 'unknown')
@@ -924,40 +1678,40 @@ class EPaperWeatherDaemon:
                 source_text = "Sol: API ✓"
             elif sun_source == 'fallback':
                 source_text = "Sol: approx"
-            self.draw.text((x + 20, y + 250), source_text, font=self.fonts['tiny'], fill=0)
+            self.draw_text((x + 20, y + 250), source_text, 'tiny')
     
     def legacy_render_barometer(self, x, y, width, height, weather_data, trigger_context):
         """BEFINTLIG: Barometer-modul rendering (oförändrad från original)"""
-        pressure = weather_data.get('pressure', 1013)
-        pressure_source = weather_data.get('pressure_source', 'unknown')
-        pressure_trend = weather_data.get('pressure_trend', {})
-        trend_text = weather_data.get('pressure_trend_text', 'Samlar data')
-        trend_arrow = weather_data.get('pressure_trend_arrow', 'stable')
+        pressure = weather_data['pressure']
+        pressure_source = weather_data['pressure_source']
+        pressure_trend = weather_data['pressure_trend']
+        trend_text = weather_data['pressure_trend_text']
+        trend_arrow = weather_data['pressure_trend_arrow']
         
         # Barometer-ikon - HÖGUPPLÖST STORLEK (80x80)
         barometer_icon = self.icon_manager.get_system_icon('barometer', size=(80, 80))
         if barometer_icon:
             self.paste_icon_on_canvas(barometer_icon, x + 15, y + 20)
-            self.draw.text((x + 100, y + 40), f"{int(pressure)}", font=self.fonts['medium_main'], fill=0)
+            self.draw_text((x + 100, y + 40), f"{int(pressure)}", 'medium_main')
         else:
-            self.draw.text((x + 20, y + 50), f"{int(pressure)}", font=self.fonts['medium_main'], fill=0)
+            self.draw_text((x + 20, y + 50), f"{int(pressure)}", 'medium_main')
         
         # hPa-text
-        self.draw.text((x + 100, y + 100), "hPa", font=self.fonts['medium_desc'], fill=0)
+        self.draw_text((x + 100, y + 100), "hPa", 'medium_desc')
         
         # RIKTIGA TREND-TEXT (från 3h-analys) - RADBRYTS OM DET ÄR "Samlar data"
         if trend_text == 'Samlar data':
-            self.draw.text((x + 20, y + 125), "Samlar", font=self.fonts['medium_desc'], fill=0)
-            self.draw.text((x + 20, y + 150), "data", font=self.fonts['medium_desc'], fill=0)
+            self.draw_text((x + 20, y + 125), "Samlar", 'medium_desc')
+            self.draw_text((x + 20, y + 150), "data", 'medium_desc')
         else:
-            self.draw.text((x + 20, y + 125), trend_text, font=self.fonts['medium_desc'], fill=0)
+            self.draw_text((x + 20, y + 125), trend_text, 'medium_desc')
         
         # BONUS: Visa numerisk 3h-förändring om tillgänglig
         if pressure_trend.get('change_3h') is not None and pressure_trend.get('trend') != 'insufficient_data':
             change_3h = pressure_trend['change_3h']
             change_text = f"{change_3h:+.1f} hPa/3h"
             change_y = y + 175 if trend_text == 'Samlar data' else y + 150
-            self.draw.text((x + 20, change_y), change_text, font=self.fonts['small_desc'], fill=0)
+            self.draw_text((x + 20, change_y), change_text, 'small_desc')
         
         # TREND-PIL från Weather Icons - OPTIMERAD STORLEK (64x64)
         trend_icon = self.icon_manager.get_pressure_icon(trend_arrow, size=(64, 64))
@@ -968,19 +1722,19 @@ class EPaperWeatherDaemon:
         
         # Visa tryck-källa (diskret)
         if pressure_source == 'netatmo':
-            self.draw.text((x + 20, y + height - 20), "(Netatmo)", font=self.fonts['tiny'], fill=0)
+            self.draw_text((x + 20, y + height - 20), "(Netatmo)", 'tiny')
         elif pressure_source == 'smhi':
-            self.draw.text((x + 20, y + height - 20), "(SMHI)", font=self.fonts['tiny'], fill=0)
+            self.draw_text((x + 20, y + height - 20), "(SMHI)", 'tiny')
     
     def legacy_render_tomorrow_forecast(self, x, y, width, height, weather_data, trigger_context):
         """BEFINTLIG: Prognos-modul rendering (oförändrad från original)"""
-        tomorrow = weather_data.get('tomorrow', {})
-        tomorrow_temp = tomorrow.get('temperature', 18.0)
-        tomorrow_desc = tomorrow.get('weather_description', 'Okänt')
-        tomorrow_symbol = tomorrow.get('weather_symbol', 3)
+        tomorrow = weather_data['tomorrow']
+        tomorrow_temp = tomorrow['temperature']
+        tomorrow_desc = tomorrow['weather_description']
+        tomorrow_symbol = tomorrow['weather_symbol']
         
         # "Imorgon" titel
-        self.draw.text((x + 20, y + 30), "Imorgon", font=self.fonts['medium_desc'], fill=0)
+        self.draw_text((x + 20, y + 30), "Imorgon", 'medium_desc')
         
         # Imorgon väderikon - HÖGUPPLÖST STORLEK (80x80)
         tomorrow_icon = self.icon_manager.get_weather_icon(tomorrow_symbol, is_night=False, size=(80, 80))
@@ -988,18 +1742,18 @@ class EPaperWeatherDaemon:
             self.paste_icon_on_canvas(tomorrow_icon, x + 140, y + 20)
         
         # Temperatur (alltid från SMHI-prognos)
-        self.draw.text((x + 20, y + 80), f"{tomorrow_temp:.1f}°", font=self.fonts['medium_main'], fill=0)
+        self.draw_text((x + 20, y + 80), f"{tomorrow_temp:.1f}°", 'medium_main')
         
         # Väderbeskrivning
         desc_truncated = self.truncate_text(tomorrow_desc, self.fonts['small_desc'], width - 60)
-        self.draw.text((x + 20, y + 130), desc_truncated, font=self.fonts['small_desc'], fill=0)
+        self.draw_text((x + 20, y + 130), desc_truncated, 'small_desc')
         
         # Visa att det är SMHI-prognos
-        self.draw.text((x + 20, y + 155), "(SMHI prognos)", font=self.fonts['tiny'], fill=0)
+        self.draw_text((x + 20, y + 155), "(SMHI prognos)", 'tiny')
     
     def legacy_render_clock(self, x, y, width, height, weather_data, trigger_context):
         """FIXAD: Klock-modul rendering med KORTA MÅNADSNAMN för E-Paper"""
-        now = datetime.now()
+        now = trigger_context.get('current_time') or datetime.now()
         
         # Hämta svenska datum-komponenter med KORTA månadsnamn
         swedish_weekday, swedish_date = self.get_swedish_date_fixed(now)
@@ -1016,42 +1770,35 @@ class EPaperWeatherDaemon:
         
         # DATUM FÖRST I BRA STORLEK (small_main = 32px - lagom större än förut)
         date_truncated = self.truncate_text(swedish_date, self.fonts['small_main'], width - 80)
-        self.draw.text((text_start_x, y + 15), date_truncated, font=self.fonts['small_main'], fill=0)
+        self.draw_text((text_start_x, y + 15), date_truncated, 'small_main')
         
         # VECKODAG UNDER I BRA STORLEK (medium_desc = 24px - större men fortfarande mindre än datum)  
         weekday_truncated = self.truncate_text(swedish_weekday, self.fonts['medium_desc'], width - 80)
-        self.draw.text((text_start_x, y + 50), weekday_truncated, font=self.fonts['medium_desc'], fill=0)
+        self.draw_text((text_start_x, y + 50), weekday_truncated, 'medium_desc')
     
     def legacy_render_status(self, x, y, width, height, weather_data, trigger_context):
         """MODIFIERAD: Status-modul med Rendering Pipeline info"""
-        update_time = datetime.now().strftime('%H:%M')
+        update_time = (trigger_context.get('current_time') or datetime.now()).strftime('%H:%M')
         
         # Status med enkla prickar
         dot_x = x + 10
         dot_size = 3
         
         # Status prick + text
-        self.draw.ellipse([
-            (dot_x, y + 28), 
-            (dot_x + dot_size, y + 28 + dot_size)
-        ], fill=0)
-        self.draw.text((dot_x + 10, y + 20), "Pipeline: ✓", font=self.fonts['small_desc'], fill=0)
+        self.draw_dot(dot_x, y + 28, dot_size)
+        self.draw_text((dot_x + 10, y + 20), "Pipeline: ✓", 'small_desc')
         
         # Update prick + text
-        self.draw.ellipse([
-            (dot_x, y + 53), 
-            (dot_x + dot_size, y + 53 + dot_size)
-        ], fill=0)
-        self.draw.text((dot_x + 10, y + 45), f"Update: {update_time}", font=self.fonts['small_desc'], fill=0)
+        self.draw_dot(dot_x, y + 53, dot_size)
+        self.draw_text((dot_x + 10, y + 45), f"Update: {update_time}", 'small_desc')
         
         # NYT: Visa rendering info
-        active_modules = self.module_manager.get_active_modules(trigger_context)
+        active_modules = trigger_context.get('active_modules')
+        if active_modules is None:
+            active_modules = self.module_manager.get_active_modules(trigger_context)
         modules_text = f"{len(active_modules)} moduler"
-        self.draw.ellipse([
-            (dot_x, y + 78), 
-            (dot_x + dot_size, y + 78 + dot_size)
-        ], fill=0)
-        self.draw.text((dot_x + 10, y + 70), f"Rendered: {modules_text}", font=self.fonts['small_desc'], fill=0)
+        self.draw_dot(dot_x, y + 78, dot_size)
+        self.draw_text((dot_x + 10, y + 70), f"Rendered: {modules_text}", 'small_desc')
     
     # === NYA HJÄLPMETODER ===
     
@@ -1060,103 +1807,114 @@ class EPaperWeatherDaemon:
         FIXAD: Konvertera datum till svenska veckodagar och KORTA månader för E-Paper
         Löser problemet med att långa månadsnamn som "Augusti" inte får plats
         """
-        swedish_days = {
-            'Monday': 'Måndag', 'Tuesday': 'Tisdag', 'Wednesday': 'Onsdag', 
-            'Thursday': 'Torsdag', 'Friday': 'Fredag', 'Saturday': 'Lördag', 'Sunday': 'Söndag'
-        }
-        
-        # FIXAD: KORTA månadsnamn för E-Paper display
-        swedish_months_short = {
-            1: 'Jan', 2: 'Feb', 3: 'Mars', 4: 'April', 5: 'Maj', 6: 'Juni',
-            7: 'Juli', 8: 'Aug', 9: 'Sep', 10: 'Okt', 11: 'Nov', 12: 'Dec'
-        }
-        
-        english_day = date_obj.strftime('%A')
-        swedish_day = swedish_days.get(english_day, english_day)
-        
-        day_num = date_obj.day
-        month_num = date_obj.month
-        swedish_month = swedish_months_short.get(month_num, str(month_num))
-        
-        return swedish_day, f"{day_num} {swedish_month}"
+        return SWEDISH_WEEKDAYS[date_obj.weekday()], f"{date_obj.day} {SWEDISH_MONTHS_SHORT[date_obj.month]}"
     
     # === BEFINTLIGA HJÄLPMETODER (oförändrade från original) ===
     
-    def clear_canvas(self):
-        """Rensa canvas (vit bakgrund)"""
-        self.draw.rectangle([(0, 0), (self.width, self.height)], fill=255)
-    
-    def draw_module_border(self, x, y, width, height, module_name):
-        """Rita smarta modulramar - NYT: PRECIPITATION MODULE INGET HÅRDKODAD INNEHÅLL"""
-        if module_name == 'main_weather':
-            self.draw.rectangle([(x, y), (x + width, y + height)], outline=0, width=2)
-            self.draw.rectangle([(x + 2, y + 2), (x + width - 2, y + height - 2)], outline=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        elif module_name == 'barometer_module':
-            self.draw.rectangle([(x, y), (x + width, y + height)], outline=0, width=2)
-            self.draw.rectangle([(x + 2, y + 2), (x + width - 2, y + height - 2)], outline=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        elif module_name == 'tomorrow_forecast':
-            self.draw.rectangle([(x, y), (x + width, y + height)], outline=0, width=2)
-            self.draw.rectangle([(x + 2, y + 2), (x + width - 2, y + height - 2)], outline=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        elif module_name == 'clock_module':
-            self.draw.line([(x, y), (x + width, y)], fill=0, width=2)
-            self.draw.line([(x, y), (x, y + height)], fill=0, width=2)
-            self.draw.line([(x, y + height), (x + width, y + height)], fill=0, width=2)
-            self.draw.line([(x + width, y), (x + width, y + height)], fill=0, width=1)
-            self.draw.line([(x + 2, y + 2), (x + width - 2, y + 2)], fill=0, width=1)
-            self.draw.line([(x + 2, y + 2), (x + 2, y + height - 2)], fill=0, width=1)
-            self.draw.line([(x + 2, y + height - 2), (x + width - 2, y + height - 2)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        elif module_name == 'status_module':
-            self.draw.line([(x, y), (x + width, y)], fill=0, width=2)
-            self.draw.line([(x + width, y), (x + width, y + height)], fill=0, width=2)
-            self.draw.line([(x, y + height), (x + width, y + height)], fill=0, width=2)
-            self.draw.line([(x, y), (x, y + height)], fill=0, width=1)
-            self.draw.line([(x + 2, y + 2), (x + width - 2, y + 2)], fill=0, width=1)
-            self.draw.line([(x + width - 2, y + 2), (x + width - 2, y + height - 2)], fill=0, width=1)
-            self.draw.line([(x + 2, y + height - 2), (x + width - 2, y + height - 2)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
-            self.draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
-        elif module_name == 'precipitation_module':
-            # FIXAT: BARA RAMAR - INGET HÅRDKODAD INNEHÅLL!
-            # Innehållet renderas av PrecipitationRenderer via ModuleFactory
-            self.draw.line([(x, y), (x + width, y)], fill=0, width=2)
-            self.draw.line([(x, y), (x, y + height)], fill=0, width=2)
-            self.draw.line([(x, y + height), (x + width, y + height)], fill=0, width=2)
-            self.draw.line([(x + width, y), (x + width, y + height)], fill=0, width=2)
-            self.draw.line([(x + 2, y + 2), (x + width - 2, y + 2)], fill=0, width=1)
-            self.draw.line([(x + 2, y + 2), (x + 2, y + height - 2)], fill=0, width=1)
-            self.draw.line([(x + 2, y + height - 2), (x + width - 2, y + height - 2)], fill=0, width=1)
-            self.draw.line([(x + width - 2, y + 2), (x + width - 2, y + height - 2)], fill=0, width=1)
+    def clear_canvas(self, active_modules=None):
+        """Rensa canvas (vit bakgrund), med förrenderade modulramar om active_modules anges"""
+        if active_modules is None:
+            self.canvas.paste(self._blank_canvas, (0, 0))
+        else:
+            self.canvas.paste(self.get_border_layer(active_modules), (0, 0))
+    
+    def get_border_layer(self, active_modules) -> Image.Image:
+        """
+        Hämta (eller rendera en gång) ett helskärmslager med ramarna för active_modules
+        
+        Modulernas koordinater kommer från config och ändras inte under körning,
+        så varje uppsättning aktiva moduler behöver bara ritas en gång.
+        """
+        key = frozenset(active_modules)
+        layer = self._border_layers.get(key)
+        
+        if layer is None:
+            # Med NumPy blir varje streck en slice-tilldelning, annars Pillows ImageDraw
+            if NUMPY_AVAILABLE:
+                pixels = np.full((self.height, self.width), 255, dtype=np.uint8)
+                layer_draw = ArrayBorderDraw(pixels)
+            else:
+                layer = Image.new('1', (self.width, self.height), 255)
+                layer_draw = ImageDraw.Draw(layer)
+            
+            for module_name in key:
+                for method, xy, kwargs in self._border_ops[module_name]:
+                    getattr(layer_draw, method)(xy, **kwargs)
+            
+            if NUMPY_AVAILABLE:
+                layer = Image.frombytes('1', (self.width, self.height), np.packbits(pixels > 0, axis=1).tobytes())
+            
+            self._border_layers[key] = layer
+            self.logger.debug(f"🖼️ Ramlager renderat för {sorted(key)}")
+        
+        return layer
+    
+    def draw_module_border(self, x, y, width, height, module_name, draw=None):
+        """Rita smarta modulramar enligt BORDER_SPEC (delad med main.py) - PRECIPITATION MODULE INGET HÅRDKODAD INNEHÅLL"""
+        draw_border(draw or self.draw, x, y, width, height, module_name)
     
     def truncate_text(self, text, font, max_width):
-        """Korta text så den får plats inom given bredd (kopierat från original)"""
+        """Korta text så den får plats inom given bredd (binärsökning över ordprefix)"""
         if not text:
             return text
-            
-        bbox = self.draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
         
-        if text_width <= max_width:
+        if self._text_width(text, font) <= max_width:
             return text
         
         words = text.split()
-        for i in range(len(words), 0, -1):
-            truncated = ' '.join(words[:i])
-            bbox = self.draw.textbbox((0, 0), truncated, font=font)
-            truncated_width = bbox[2] - bbox[0]
-            
-            if truncated_width <= max_width:
-                return truncated
+        
+        # Längsta ordprefix som får plats - bredden växer med antalet ord
+        low, high = 1, len(words)
+        best = None
+        while low <= high:
+            mid = (low + high) // 2
+            truncated = ' '.join(words[:mid])
+            if self._text_width(truncated, font) <= max_width:
+                best = truncated
+                low = mid + 1
+            else:
+                high = mid - 1
+        
+        if best is not None:
+            return best
         
         return words[0] if words else text
     
+    def _measure_text_width(self, text, font):
+        """Mät textbredd med Pillow (anropas via self._text_width-cachen)"""
+        bbox = self.draw.textbbox((0, 0), text, font=font)
+        return bbox[2] - bbox[0]
+    
+    def _rasterize_text(self, text, font_name):
+        """Rastrera text en gång till (mask, dx, dy) (anropas via self._text_sprite-cachen)"""
+        font = self.fonts[font_name]
+        left, top, right, bottom = self.draw.textbbox((0, 0), text, font=font)
+        mask = Image.new('1', (max(right - left, 1), max(bottom - top, 1)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+        return mask, left, top
+    
+    def draw_text(self, xy, text, font_name):
+        """
+        Rita svart text via cachad sprite
+        
+        Texten rastreras av FreeType bara första gången per (text, font); därefter
+        blir den en mask-paste på canvas med samma pixlar som draw.text.
+        """
+        mask, left, top = self._text_sprite(text, font_name)
+        self.canvas.paste(0, (xy[0] + left, xy[1] + top), mask)
+    
+    def draw_dot(self, x, y, size):
+        """Rita status-prick (fylld ellips size x size) via cachad sprite"""
+        key = ('dot', size)
+        mask = self._sprites.get(key)
+        
+        if mask is None:
+            mask = Image.new('1', (size + 1, size + 1), 0)
+            ImageDraw.Draw(mask).ellipse([(0, 0), (size, size)], fill=255)
+            self._sprites[key] = mask
+        
+        self.canvas.paste(0, (x, y), mask)
+    
     def paste_icon_on_canvas(self, icon, x, y):
         """Sätt in ikon på canvas (kopierat från original)"""
         if icon is None:
@@ -1167,30 +1925,28 @@ class EPaperWeatherDaemon:
         except Exception as e:
             self.logger.error(f"❌ Fel vid ikon-inplacering: {e}")
     
-    def update_state(self, weather_data: Dict):
+    def update_state(self, snapshot: Dict, now: Optional[datetime] = None):
         """Uppdatera daemon state i minnet + LAYOUT STATE"""
-        # BEFINTLIG state (oförändrad)
-        self.current_display_state = {
-            'temperature': weather_data.get('temperature'),
-            'weather_symbol': weather_data.get('weather_symbol'),
-            'weather_description': weather_data.get('weather_description'),
-            'pressure': weather_data.get('pressure'),
-            'pressure_trend_text': weather_data.get('pressure_trend_text'),
-            'pressure_trend_arrow': weather_data.get('pressure_trend_arrow'),
-            'tomorrow_temp': weather_data.get('tomorrow', {}).get('temperature'),
-            'tomorrow_symbol': weather_data.get('tomorrow', {}).get('weather_symbol'),
-            'tomorrow_desc': weather_data.get('tomorrow', {}).get('weather_description'),
-            'sunrise': weather_data.get('sun_data', {}).get('sunrise'),
-            'sunset': weather_data.get('sun_data', {}).get('sunset'),
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'last_update': time.time()
-        }
+        now = now or datetime.now()
+        wall_time = time.time()
+        
+        # BEFINTLIG state: samma fält som jämförs i should_update_display
+        self.current_display_state = {key: snapshot.get(key) for key, _, _, _ in self.COMPARE_SPEC}
+        
+        # Numeriska fält lagras även förskalade (t.ex. temperature_10) för heltalsjämförelse
+        for key, _, scale, _ in self.COMPARE_SPEC:
+            value = self.current_display_state[key]
+            if scale is not None and value is not None:
+                self.current_display_state[f'{key}_{scale}'] = int(round(float(value) * scale))
+        self.current_display_state['digest'] = compare_digest(snapshot)
+        self.current_display_state['date'] = now.strftime('%Y-%m-%d')
+        self.current_display_state['last_update'] = wall_time
         
         # NYT: Layout state tracking
-        trigger_context = self.module_manager.build_trigger_context(weather_data)
+        trigger_context = self.module_manager.build_trigger_context(snapshot, now)
         self.current_layout_state = self.module_manager.get_current_layout_state(trigger_context)
         
-        self.last_update_time = time.time()
+        self.last_update_time = wall_time
     
     def run_daemon(self):
         """Huvudloop för daemon"""
@@ -1206,20 +1962,23 @@ class EPaperWeatherDaemon:
                 
                 try:
                     # Hämta väderdata
-                    weather_data = self.fetch_weather_data()
+                    weather_data, snapshot = self.fetch_weather_data()
+                    
+                    # En tidsstämpel för hela iterationen (jämförelse, rendering och state)
+                    now = datetime.now()
                     
                     if weather_data:
                         # Avgör om uppdatering behövs (nu med layout change detection)
-                        should_update, reason = self.should_update_display(weather_data)
+                        should_update, reason = self.should_update_display(snapshot, now)
                         
                         if should_update:
                             self.logger.info(f"🔄 UPPDATERAR E-Paper: {reason}")
                             
                             # Rendera och visa (nu med Rendering Pipeline)
-                            self.render_and_display(weather_data)
+                            self.render_and_display(weather_data, snapshot, now)
                             
                             # Uppdatera state i minnet (nu med layout state)
-                            self.update_state(weather_data)
+                            self.update_state(snapshot, now)
                             
                             print(f"🔄 E-Paper uppdaterad: {reason}")
                             
@@ -1230,9 +1989,10 @@ class EPaperWeatherDaemon:
                 except Exception as e:
                     self.logger.error(f"❌ Fel i daemon iteration #{iteration}: {e}")
                 
-                # Vänta till nästa iteration
+                # Vänta till nästa iteration (avbryts direkt av signal_handler/wake_handler)
                 if self.running:
-                    time.sleep(self.update_interval)
+                    self._wake.wait(self.update_interval)
+                    self._wake.clear()
         
         except KeyboardInterrupt:
             self.logger.info("⚠️ Daemon avbruten av användare")
@@ -1244,7 +2004,12 @@ class EPaperWeatherDaemon:
     def cleanup(self):
         """Cleanup vid shutdown"""
         try:
-            if self.epd:
+            # Låt display-tråden visa klart innan panelen sövs
+            if hasattr(self, '_display_thread') and self._display_thread.is_alive():
+                self._display_queue.put(None)
+                self._display_thread.join(timeout=60)
+            
+            if self.epd and not getattr(self, '_panel_asleep', False):
                 self.epd.sleep()
             
             if hasattr(self, 'icon_manager'):
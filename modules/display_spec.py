@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Delade tabeller för main.py och main_daemon.py
+Vilka väderfält som avgör om E-Paper-skärmen ska uppdateras (och hur de jämförs),
+samt hur modulramarna ritas
+"""
+
+import json
+import hashlib
+
+# Fält som avgör om skärmen ska uppdateras: (nyckel, sökväg i weather_data, skala, beskrivning)
+# Numeriska fält har skala = antal steg per enhet (10 = tiondelar), övriga jämförs exakt
+COMPARE_SPEC = (
+    ('temperature', ('temperature',), 10, 'Temperatur'),
+    ('weather_symbol', ('weather_symbol',), None, 'Väderikon'),
+    ('weather_description', ('weather_description',), None, 'Väderbeskrivning'),
+    ('pressure', ('pressure',), 10, 'Lufttryck'),
+    ('pressure_trend_text', ('pressure_trend_text',), None, 'Trycktrend text'),
+    ('pressure_trend_arrow', ('pressure_trend_arrow',), None, 'Trycktrend pil'),
+    ('tomorrow_temp', ('tomorrow', 'temperature'), 10, 'Imorgon temperatur'),
+    ('tomorrow_symbol', ('tomorrow', 'weather_symbol'), None, 'Imorgon väderikon'),
+    ('tomorrow_desc', ('tomorrow', 'weather_description'), None, 'Imorgon beskrivning'),
+    ('sunrise', ('sun_data', 'sunrise'), None, 'Soluppgång'),
+    ('sunset', ('sun_data', 'sunset'), None, 'Solnedgång'),
+)
+
+
+def get_path(data, path):
+    """Hämta nästlat värde ur dict via nyckelsökväg, None om något steg saknas"""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def extract_compare_values(weather_data):
+    """Platta ut COMPARE_SPEC-fälten ur weather_data till {nyckel: värde}"""
+    return {key: get_path(weather_data, path) for key, path, _, _ in COMPARE_SPEC}
+
+
+def compare_digest(values):
+    """
+    Digest över COMPARE_SPEC-fälten i values
+    
+    Numeriska fält kvantiseras först (t.ex. tiondelar) så att samma visade värde ger
+    samma digest oavsett float-brus. Lika digest betyder att fältjämförelsen kan hoppas över.
+    """
+    quantized = []
+    for key, _, scale, _ in COMPARE_SPEC:
+        value = values.get(key)
+        if scale is not None and value is not None:
+            value = int(round(float(value) * scale))
+        quantized.append(value)
+    payload = json.dumps(quantized, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+# Modulramar: (ytterkant, innerkantens sidor, hörnmarkering)
+# Ytterkant 'rectangle' = 2 px kontur inåt, annars (sida, linjebredd) per sida
+# clock/status ritar den gemensamma mittkanten tunt så den inte dubbleras
+# Precipitation: BARA RAMAR - innehållet renderas av PrecipitationRenderer via ModuleFactory
+BORDER_SPEC = {
+    'main_weather': ('rectangle', ('top', 'right', 'bottom', 'left'), True),
+    'barometer_module': ('rectangle', ('top', 'right', 'bottom', 'left'), True),
+    'tomorrow_forecast': ('rectangle', ('top', 'right', 'bottom', 'left'), True),
+    'clock_module': ((('top', 2), ('left', 2), ('bottom', 2), ('right', 1)),
+                     ('top', 'left', 'bottom'), True),
+    'status_module': ((('top', 2), ('right', 2), ('bottom', 2), ('left', 1)),
+                      ('top', 'right', 'bottom'), True),
+    'precipitation_module': ((('top', 2), ('left', 2), ('bottom', 2), ('right', 2)),
+                             ('top', 'left', 'bottom', 'right'), False),
+}
+
+
+def border_side(side, x, y, width, height, inset):
+    """Linje för en ramsida (top/right/bottom/left), inset pixlar in från modulens kant"""
+    x0, y0, x1, y1 = x + inset, y + inset, x + width - inset, y + height - inset
+    if side == 'top':
+        return [(x0, y0), (x1, y0)]
+    if side == 'right':
+        return [(x1, y0), (x1, y1)]
+    if side == 'bottom':
+        return [(x0, y1), (x1, y1)]
+    return [(x0, y0), (x0, y1)]
+
+
+def draw_border(draw, x, y, width, height, module_name):
+    """
+    Rita modulram enligt BORDER_SPEC med draw (ImageDraw eller kompatibel inspelare)
+    
+    Moduler utan post i BORDER_SPEC får ingen ram.
+    """
+    spec = BORDER_SPEC.get(module_name)
+    if spec is None:
+        return
+    
+    outer, inner_sides, corner_mark = spec
+    
+    # Ytterkant: dubbel rektangel-kontur eller enskilda sidor med egen tjocklek
+    if outer == 'rectangle':
+        draw.rectangle([(x, y), (x + width, y + height)], outline=0, width=2)
+    else:
+        for side, line_width in outer:
+            draw.line(border_side(side, x, y, width, height, 0), fill=0, width=line_width)
+    
+    # Innerkant 2 px in
+    for side in inner_sides:
+        draw.line(border_side(side, x, y, width, height, 2), fill=0, width=1)
+    
+    # Dekorativ hörnmarkering uppe till vänster
+    if corner_mark:
+        draw.line([(x + 8, y + 8), (x + 20, y + 8)], fill=0, width=1)
+        draw.line([(x + 8, y + 8), (x + 8, y + 20)], fill=0, width=1)
@@ -12,7 +12,7 @@ KORRIGERAT: Vindstyrka-brytpunkter enligt SMHI:s officiella tabell
 import os
 import sys
 from datetime import datetime
-from PIL import Image, ImageEnhance
+from PIL import Image, ImageEnhance, ImageDraw, ImageFont
 import logging
 
 class WeatherIconManager:
@@ -28,6 +28,10 @@ class WeatherIconManager:
         self.icon_path = icon_base_path
         self.icon_cache = {}
         
+        # Snabbväg för väderikoner: (smhi_symbol, is_night, size) → ikon (eller None om filen saknas)
+        # Slipper bygga sökväg och cache-nyckel som strängar vid varje rendering
+        self.weather_icon_cache = {}
+        
         # Exakt samma mappning som Väderdisplayens utils.py
         self.smhi_mapping = {
             1: {"day": "wi-day-sunny", "night": "wi-night-clear"},                    # Klart
@@ -127,6 +131,10 @@ class WeatherIconManager:
         Returns:
             PIL Image-objekt optimerat för E-Paper, eller None vid fel
         """
+        key = (smhi_symbol, bool(is_night), size)
+        if key in self.weather_icon_cache:
+            return self.weather_icon_cache[key]
+        
         if smhi_symbol not in self.smhi_mapping:
             self.logger.warning(f"⚠️ Okänd SMHI-symbol: {smhi_symbol}")
             return self.create_fallback_icon(size, f"?{smhi_symbol}")
@@ -134,7 +142,9 @@ class WeatherIconManager:
         icon_data = self.smhi_mapping[smhi_symbol]
         icon_name = icon_data['night' if is_night else 'day']
         
-        return self.load_icon(f"weather/{icon_name}.png", size)
+        icon = self.load_icon(f"weather/{icon_name}.png", size)
+        self.weather_icon_cache[key] = icon
+        return icon
     
     def get_pressure_icon(self, trend, size=(64, 64)):
         """
@@ -148,7 +158,7 @@ class WeatherIconManager:
             PIL Image-objekt eller None vid fel
         """
         icon_name = self.pressure_mapping.get(trend, 'wi-direction-right')  # Fallback till stabilt
-        self.logger.info(f"🎯 Pressure icon mapping (BEFINTLIGA): {trend} → {icon_name}")
+        self.logger.debug(f"🎯 Pressure icon mapping (BEFINTLIGA): {trend} → {icon_name}")
         
         # Ladda från pressure/ katalogen (befintliga ikoner med ringar)
         pressure_icon = self.load_icon(f"pressure/{icon_name}.png", size)
@@ -193,11 +203,11 @@ class WeatherIconManager:
         
         # Special logging för nya ikoner
         if system_type == 'calendar':
-            self.logger.info(f"📅 Kalender-ikon begärd: {icon_name} ({size[0]}x{size[1]})")
+            self.logger.debug(f"📅 Kalender-ikon begärd: {icon_name} ({size[0]}x{size[1]})")
         elif system_type == 'barometer':
-            self.logger.info(f"📊 Barometer-ikon begärd: {icon_name} ({size[0]}x{size[1]})")
+            self.logger.debug(f"📊 Barometer-ikon begärd: {icon_name} ({size[0]}x{size[1]})")
         elif system_type == 'strong-wind':
-            self.logger.info(f"🌬️ Generell wind-ikon begärd: {icon_name} ({size[0]}x{size[1]})")
+            self.logger.debug(f"🌬️ Generell wind-ikon begärd: {icon_name} ({size[0]}x{size[1]})")
         
         return self.load_icon(f"system/{icon_name}.png", size)
     
@@ -324,6 +334,7 @@ class WeatherIconManager:
             # Kontrollera att filen finns
             if not os.path.exists(full_path):
                 self.logger.warning(f"⚠️ Ikon-fil saknas: {full_path}")
+                self.icon_cache[cache_key] = None  # Cacha även saknade filer - ingen ny stat per rendering
                 return None  # Returnera None istället för fallback för bättre felhantering
             
             # Ladda ikon
@@ -465,39 +476,39 @@ class WeatherIconManager:
         Returns:
             PIL Image-objekt med fallback-ikon
         """
+        # Fallback-ikoner återanvänds - saknade ikoner begärs om varje rendering
+        cache_key = f"fallback/{text}_{size[0]}x{size[1]}"
+        if cache_key in self.icon_cache:
+            return self.icon_cache[cache_key]
+        
         try:
             # Skapa tom vit bild
             fallback = Image.new('1', size, 255)
             
-            # Om PIL har textfunktioner, lägg till enkel text
+            # Lägg till enkel text
+            draw = ImageDraw.Draw(fallback)
+            
+            # Försök använda standard-font
+            font_size = min(size) // 2
             try:
-                from PIL import ImageDraw, ImageFont
-                draw = ImageDraw.Draw(fallback)
-                
-                # Försök använda standard-font
-                font_size = min(size) // 2
-                try:
-                    font = ImageFont.load_default()
-                except:
-                    font = None
-                
-                # Centrera text
-                if font:
-                    bbox = draw.textbbox((0, 0), text, font=font)
-                    text_width = bbox[2] - bbox[0]
-                    text_height = bbox[3] - bbox[1]
-                    x = (size[0] - text_width) // 2
-                    y = (size[1] - text_height) // 2
-                    draw.text((x, y), text, font=font, fill=0)
-                else:
-                    # Enkel punkt i mitten om font inte fungerar
-                    center_x, center_y = size[0] // 2, size[1] // 2
-                    draw.point((center_x, center_y), fill=0)
-                    
-            except ImportError:
-                # Om ImageDraw inte finns, returnera tom ikon
-                pass
+                font = ImageFont.load_default()
+            except:
+                font = None
+            
+            # Centrera text
+            if font:
+                bbox = draw.textbbox((0, 0), text, font=font)
+                text_width = bbox[2] - bbox[0]
+                text_height = bbox[3] - bbox[1]
+                x = (size[0] - text_width) // 2
+                y = (size[1] - text_height) // 2
+                draw.text((x, y), text, font=font, fill=0)
+            else:
+                # Enkel punkt i mitten om font inte fungerar
+                center_x, center_y = size[0] // 2, size[1] // 2
+                draw.point((center_x, center_y), fill=0)
             
+            self.icon_cache[cache_key] = fallback
             self.logger.debug(f"🔧 Fallback-ikon skapad: {size[0]}x{size[1]} ('{text}')")
             return fallback
             
@@ -563,10 +574,28 @@ class WeatherIconManager:
         # Hämta korrekt väderikon
         return self.get_weather_icon(smhi_symbol, is_night, size)
     
+    def preload_weather_icons(self, size, include_night=True):
+        """
+        Förladda väderikoner för alla SMHI-symboler i given storlek
+        
+        Args:
+            size: Tuple med ikon-storlek
+            include_night: Ladda även natt-varianter
+        """
+        night_flags = (False, True) if include_night else (False,)
+        
+        # Via get_weather_icon så att även (symbol, is_night, size)-snabbvägen fylls
+        for smhi_symbol in self.smhi_mapping:
+            for is_night in night_flags:
+                self.get_weather_icon(smhi_symbol, is_night, size)
+        
+        self.logger.info(f"🎨 {len(self.smhi_mapping) * len(night_flags)} väderikon-varianter förladdade ({size[0]}x{size[1]})")
+    
     def clear_cache(self):
         """Rensa ikon-cache för att frigöra minne"""
         cache_size = len(self.icon_cache)
         self.icon_cache.clear()
+        self.weather_icon_cache.clear()
         self.logger.info(f"🗑️ Ikon-cache rensad: {cache_size} ikoner borttagna")
         print(f"🗑️ Ikon-cache rensad: {cache_size} ikoner")
     
@@ -36,7 +36,7 @@ class PrecipitationRenderer(ModuleRenderer):
         (mer luft mellan raderna)
         """
         try:
-            self.logger.info(f"🌧️ Renderar layout-förbättrad nederbörd-modul ({width}×{height})")
+            self.logger.debug(f"🌧️ Renderar layout-förbättrad nederbörd-modul ({width}×{height})")
             
             # Hämta nederbörd-data med säker fallback
             precipitation = self.safe_get_value(context_data, 'precipitation', 0.0, float)
@@ -60,7 +60,7 @@ class PrecipitationRenderer(ModuleRenderer):
             # 3. DETALJER (FÖRBÄTTRAT: mer luft mellan raderna)
             self._render_details_spaced(x, y, width, detail_text)
             
-            self.logger.info(f"✅ Layout-förbättrad nederbörd-modul rendered: {main_status}")
+            self.logger.debug(f"✅ Layout-förbättrad nederbörd-modul rendered: {main_status}")
             return True
             
         except Exception as e:
@@ -50,7 +50,7 @@ class WindRenderer(ModuleRenderer):
             True om rendering lyckades
         """
         try:
-            self.logger.info(f"🧹 Renderar REN SLUTLIG wind-modul ({width}×{height})")
+            self.logger.debug(f"🧹 Renderar REN SLUTLIG wind-modul ({width}×{height})")
             
             # === KOLLEGANS SLUTLIGA KONSTANTER ===
             PADDING = 20
@@ -129,7 +129,7 @@ class WindRenderer(ModuleRenderer):
                 desc_x = x + PADDING
                 desc_y = ms_y + ms_h + ROW_GAP_PRIMARY + i * (text_h(line, desc_font) + LINE_GAP)
                 self.draw_text_with_fallback((desc_x, desc_y), line, desc_font, fill=0)
-                self.logger.info(f"📝 Beskrivningsrad {i+1}: '{line}'")
+                self.logger.debug(f"📝 Beskrivningsrad {i+1}: '{line}'")
             
             # === 2. SEKUNDÄRBLOCK: KARDINALPIL + RIKTNING (VÄNSTERLINJERAT NEDERST) ===
             
@@ -145,7 +145,7 @@ class WindRenderer(ModuleRenderer):
             if cardinal_icon:
                 self.paste_icon_on_canvas(cardinal_icon, cx, base_y)
                 cx += CARDINAL_ICON_SIZE[0] + CARDINAL_GAP
-                self.logger.info(f"✅ Kardinalpil renderad vänsterlinjerat: {cardinal_code}")
+                self.logger.debug(f"✅ Kardinalpil renderad vänsterlinjerat: {cardinal_code}")
             else:
                 self.logger.warning(f"⚠️ Kardinalpil saknas för kod: {cardinal_code}")
                 # Använd enkel fallback-pil
@@ -160,7 +160,7 @@ class WindRenderer(ModuleRenderer):
             # RESONEMANG: Tar bort visuellt brus, låter primärdata dominera
             # RESULTAT: Renare layout med tydlig hierarki
             
-            self.logger.info(f"✅ REN SLUTLIG cykel-optimerad wind-modul: {wind_speed:.1f}m/s {speed_description}, {direction_short}")
+            self.logger.debug(f"✅ REN SLUTLIG cykel-optimerad wind-modul: {wind_speed:.1f}m/s {speed_description}, {direction_short}")
             return True
             
         except Exception as e:
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+SMHI forecast-iteration för debug-skripten
+Gemensam hämtning (diskcache, valfri ijson-strömning) och parsning av timeSeries
+till lätta Forecast-tupler istället för dict-uppslag per prognos
+"""
+
+import os
+import json
+import time
+import logging
+from collections import namedtuple
+from datetime import datetime, timezone, timedelta
+
+import requests
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_UTC = timezone.utc
+
+# Prognosparametrar som debug-analysen (och analyze_cycling_weather) läser
+WANTED_PARAMS = frozenset({'pmin', 'pcat', 'Wsymb2', 't'})
+
+# En parsad prognos: t = aware UTC-datetime, övriga fält None om parametern saknas
+# (namedtuple saknar per-instans __dict__ och har C-accessorer - lika kompakt som en slots-dataclass)
+Forecast = namedtuple('Forecast', 't wsymb pmin pcat temp raw')
+
+# Tidsfönster för en debug-körning: datetime, HH:MM-strängar och timestamps beräknade en gång
+TimeCtx = namedtuple('TimeCtx', 'now end now_str end_str now_ts end_ts')
+
+
+def make_time_ctx(hours):
+    """Bygg TimeCtx för fönstret nu (UTC) → nu + hours"""
+    now = datetime.now(_UTC)
+    end = now + timedelta(hours=hours)
+    return TimeCtx(now, end,
+                   f"{now.hour:02d}:{now.minute:02d}", f"{end.hour:02d}:{end.minute:02d}",
+                   now.timestamp(), end.timestamp())
+
+
+def parse_smhi_time(s):
+    """Parsa SMHI validTime (alltid 'YYYY-MM-DDTHH:MM:SSZ') utan generell ISO-parser"""
+    return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                    int(s[11:13]), int(s[14:16]), int(s[17:19]), tzinfo=_UTC)
+
+
+def flatten_params(forecast, wanted=WANTED_PARAMS):
+    """Platta ut de önskade parametrarna till {namn: första värde} - avbryter när alla hittats"""
+    params = {}
+    for param in forecast.get('parameters', ()):
+        name = param.get('name')
+        if name in wanted and param.get('values'):
+            params[name] = param['values'][0]
+            if len(params) == len(wanted):
+                break
+    return params
+
+
+def iter_forecasts(time_series):
+    """
+    Iterera SMHI timeSeries som Forecast-tupler
+    
+    Args:
+        time_series: Iterable av SMHI timeSeries-poster (lista, slice eller islice)
+    
+    Yields:
+        Forecast per post; poster som inte går att parsa loggas och hoppas över
+    """
+    for forecast in time_series:
+        try:
+            params = flatten_params(forecast)
+            yield Forecast(
+                parse_smhi_time(forecast['validTime']),
+                params.get('Wsymb2'),
+                params.get('pmin'),
+                params.get('pcat'),
+                params.get('t'),
+                forecast
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Fel vid parsning av forecast {forecast.get('validTime', '?')}: {e}")
+
+
+def load_json_file(path):
+    """Läs en JSON-fil som bytes och parsa med orjson om det finns (annars json)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def fetch_smhi_forecast(client):
+    """
+    Hämta SMHI forecast - med ijson strömmas svaret och bara validTime + WANTED_PARAMS behålls
+    
+    Utan ijson (eller om strömningen misslyckas) används WeatherClient som vanligt.
+    """
+    if not IJSON_AVAILABLE:
+        return client.get_smhi_forecast_data()
+    
+    url = f"https://opendata-download-metfcst.smhi.se/api/category/pmp3g/version/2/geotype/point/lon/{client.longitude}/lat/{client.latitude}/data.json"
+    
+    try:
+        # Klientens session (om den finns) så att anslutningen till SMHI återanvänds
+        http = getattr(client, 'session', requests)
+        with http.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            time_series = [
+                {
+                    'validTime': forecast['validTime'],
+                    'parameters': [p for p in forecast.get('parameters', ()) if p.get('name') in WANTED_PARAMS]
+                }
+                for forecast in ijson.items(response.raw, 'timeSeries.item', use_float=True)
+            ]
+        return {'timeSeries': time_series}
+    except Exception as e:
+        logger.warning(f"⚠️ Strömmad SMHI-hämtning misslyckades ({e}) - använder WeatherClient")
+        return client.get_smhi_forecast_data()
+
+
+def cached_smhi_forecast(client, ttl=600):
+    """
+    Hämta SMHI forecast via diskcache som delas mellan debug-körningar och -skript
+    
+    Nyckeln är position + ttl-intervall, så samma prognos återanvänds i högst ttl sekunder.
+    """
+    cache_file = 'cache/debug_smhi_forecast.json'
+    key = f"{client.latitude},{client.longitude},{int(time.time() // ttl)}"
+    
+    try:
+        cached = load_json_file(cache_file)
+        if cached.get('key') == key and cached.get('data'):
+            logger.info(f"📋 Använder cachad SMHI forecast ({cache_file})")
+            return cached['data']
+    except (OSError, ValueError):
+        pass
+    
+    data = fetch_smhi_forecast(client)
+    if data:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'data': data}, f)
+        except OSError as e:
+            logger.warning(f"⚠️ Kunde inte spara SMHI-cache: {e}")
+    return data
@@ -15,6 +15,7 @@ FAS 1: VINDRIKTNING API-UTÖKNING - Hämtar nu både vindstyrka (ws) och vindrik
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import logging
@@ -22,9 +23,19 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional, Any
 
-# Importera SunCalculator (med fallback)
+# orjson (valfritt) för snabbare parsning av stora SMHI-prognoser
 try:
-    from sun_calculator import SunCalculator
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Importera SunCalculator (med fallback) - både via sys.path 'modules' och som modules-paket
+try:
+    try:
+        from sun_calculator import SunCalculator
+    except ImportError:
+        from .sun_calculator import SunCalculator
     SUN_CALCULATOR_AVAILABLE = True
 except ImportError:
     print("⚠️ SunCalculator ej tillgänglig - använder förenklad solberäkning")
@@ -57,6 +68,10 @@ class WeatherClient:
         self.netatmo_token_url = "https://api.netatmo.com/oauth2/token"
         self.netatmo_stations_url = "https://api.netatmo.com/api/getstationsdata"
         
+        # En HTTP-session för alla API-anrop: återanvänder TCP/TLS-anslutningar mellan hämtningar
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=2))
+        
         # SunCalculator för exakta soltider (om tillgänglig)
         if SUN_CALCULATOR_AVAILABLE:
             self.sun_calculator = SunCalculator()
@@ -71,6 +86,10 @@ class WeatherClient:
         # NYTT: Cache för SMHI observations (15 min - data kommer varje timme)
         self.observations_cache = {'data': None, 'timestamp': 0}
         
+        # Senaste SMHI forecast-svaret + dess ETag/Last-Modified för conditional GET
+        # (get_smhi_data och get_smhi_forecast_data hämtar samma URL)
+        self.smhi_forecast_http = {'url': None, 'validators': {}, 'data': None}
+        
         # NYTT: Tryckhistorik för 3-timmars tendenser (meteorologisk standard)
         self.pressure_history_file = "cache/pressure_history.json"
         self.ensure_cache_directory()
@@ -121,7 +140,7 @@ class WeatherClient:
             # Parameter 7 = Nederbördsmängd, summa 1 timme, 1 gång/tim, enhet: millimeter
             url = f"https://opendata-download-metobs.smhi.se/api/version/latest/parameter/7/station/{self.observations_station_id}/period/latest-hour/data.json"
             
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -160,7 +179,7 @@ class WeatherClient:
             
             url = f"https://opendata-download-metobs.smhi.se/api/version/latest/parameter/7/station/{self.alternative_station_id}/period/latest-hour/data.json"
             
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -745,7 +764,7 @@ class WeatherClient:
                 'client_secret': self.netatmo_config['client_secret']
             }
             
-            response = requests.post(self.netatmo_token_url, data=data, timeout=10)
+            response = self.session.post(self.netatmo_token_url, data=data, timeout=10)
             response.raise_for_status()
             
             token_data = response.json()
@@ -802,7 +821,7 @@ class WeatherClient:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(self.netatmo_stations_url, headers=headers, timeout=15)
+            response = self.session.get(self.netatmo_stations_url, headers=headers, timeout=15)
             response.raise_for_status()
             
             stations_data = response.json()
@@ -934,6 +953,42 @@ class WeatherClient:
             self.logger.error(f"❌ Fel vid parsning av Netatmo-data: {e}")
             return {}
     
+    @staticmethod
+    def _decode_json(response) -> Any:
+        """Parsa JSON-svar - orjson direkt på bytes om det finns, annars requests egen parser"""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
+    
+    def _fetch_smhi_forecast_json(self) -> Dict[str, Any]:
+        """
+        Hämta SMHI point forecast med conditional GET
+        
+        Skickar If-None-Match/If-Modified-Since från förra svaret; vid 304 Not Modified
+        återanvänds det redan parsade svaret istället för att ladda ner och parsa om JSON.
+        """
+        url = f"https://opendata-download-metfcst.smhi.se/api/category/pmp3g/version/2/geotype/point/lon/{self.longitude}/lat/{self.latitude}/data.json"
+        
+        cached = self.smhi_forecast_http
+        headers = cached['validators'] if cached['url'] == url and cached['data'] is not None else {}
+        
+        response = self.session.get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            self.logger.debug("📋 SMHI forecast oförändrad (304) - återanvänder senaste svaret")
+            return cached['data']
+        
+        response.raise_for_status()
+        data = self._decode_json(response)
+        
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        self.smhi_forecast_http = {'url': url, 'validators': validators, 'data': data}
+        
+        return data
+    
     def get_smhi_forecast_data(self) -> Dict[str, Any]:
         """
         NYTT: Hämta full SMHI forecast data för cykel-analys
@@ -946,13 +1001,7 @@ class WeatherClient:
             self.logger.debug("🌐 Hämtar full SMHI forecast för cykel-analys...")
             
             # SMHI Meteorologiska prognoser API (samma som get_smhi_data)
-            url = f"https://opendata-download-metfcst.smhi.se/api/category/pmp3g/version/2/geotype/point/lon/{self.longitude}/lat/{self.latitude}/data.json"
-            
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            return data
+            return self._fetch_smhi_forecast_json()
             
         except Exception as e:
             self.logger.error(f"❌ SMHI forecast data-fel: {e}")
@@ -970,12 +1019,7 @@ class WeatherClient:
             self.logger.info("🌐 Hämtar SMHI väderdata med VINDRIKTNING...")
             
             # SMHI Meteorologiska prognoser API
-            url = f"https://opendata-download-metfcst.smhi.se/api/category/pmp3g/version/2/geotype/point/lon/{self.longitude}/lat/{self.latitude}/data.json"
-            
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._fetch_smhi_forecast_json()
             
             # Hitta närmaste tidpunkt - FIX: Använd timezone-aware datetime
             now = datetime.now(timezone.utc)
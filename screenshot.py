@@ -24,6 +24,11 @@ sys.path.append('modules')
 from weather_client import WeatherClient
 from icon_manager import WeatherIconManager
 
+# Svenska veckodagar indexerade med date.weekday() och månader med date.month (som main.py)
+SWEDISH_WEEKDAYS = ('Måndag', 'Tisdag', 'Onsdag', 'Torsdag', 'Fredag', 'Lördag', 'Söndag')
+SWEDISH_MONTHS = (None, 'Januari', 'Februari', 'Mars', 'April', 'Maj', 'Juni',
+                  'Juli', 'Augusti', 'September', 'Oktober', 'November', 'December')
+
 class EPaperScreenshotGenerator:
     """Genererar exakt kopia av vad som visas på E-Paper skärmen"""
     
@@ -242,8 +247,9 @@ class EPaperScreenshotGenerator:
                         self.draw.text((x + 20, y + 15), location, font=self.fonts['medium_desc'], fill=0)
                         
                         # VÄDERIKON med exakt dag/natt-logik (96x96)
+                        # Soltiderna skickas som redan parsade datetime - ingen isoformat-rundtur i icon_manager
                         weather_icon = self.icon_manager.get_weather_icon_for_time(
-                            smhi_symbol, current_time, sun_data, size=(96, 96)
+                            smhi_symbol, current_time, {'sunrise': sunrise, 'sunset': sunset}, size=(96, 96)
                         )
                         if weather_icon:
                             icon_x = x + 320
@@ -434,8 +440,8 @@ class EPaperScreenshotGenerator:
     # === HJÄLPMETODER (kopierade exakt från daemon) ===
     
     def clear_canvas(self):
-        """Rensa canvas (vit bakgrund)"""
-        self.draw.rectangle([(0, 0), (self.width, self.height)], fill=255)
+        """Rensa canvas (vit bakgrund) - fyller bufferten direkt istället för att rita en rektangel"""
+        self.canvas.paste(255, (0, 0, self.width, self.height))
     
     def draw_module_border(self, x, y, width, height, module_name):
         """Rita smarta modulramar (exakt som daemon)"""
@@ -477,24 +483,7 @@ class EPaperScreenshotGenerator:
     
     def get_swedish_date(self, date_obj):
         """Svenska veckodagar och månader (exakt som daemon)"""
-        swedish_days = {
-            'Monday': 'Måndag', 'Tuesday': 'Tisdag', 'Wednesday': 'Onsdag', 
-            'Thursday': 'Torsdag', 'Friday': 'Fredag', 'Saturday': 'Lördag', 'Sunday': 'Söndag'
-        }
-        
-        swedish_months = {
-            1: 'Januari', 2: 'Februari', 3: 'Mars', 4: 'April', 5: 'Maj', 6: 'Juni',
-            7: 'Juli', 8: 'Augusti', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'December'
-        }
-        
-        english_day = date_obj.strftime('%A')
-        swedish_day = swedish_days.get(english_day, english_day)
-        
-        day_num = date_obj.day
-        month_num = date_obj.month
-        swedish_month = swedish_months.get(month_num, str(month_num))
-        
-        return swedish_day, f"{day_num} {swedish_month}"
+        return SWEDISH_WEEKDAYS[date_obj.weekday()], f"{date_obj.day} {SWEDISH_MONTHS[date_obj.month]}"
     
     def truncate_text(self, text, font, max_width):
         """Korta text så den får plats (exakt som daemon)"""
@@ -507,14 +496,22 @@ class EPaperScreenshotGenerator:
         if text_width <= max_width:
             return text
         
+        # Längsta ordprefix som får plats (binärsökning - bredden växer med antalet ord)
         words = text.split()
-        for i in range(len(words), 0, -1):
-            truncated = ' '.join(words[:i])
+        low, high = 1, len(words)
+        best = None
+        while low <= high:
+            mid = (low + high) // 2
+            truncated = ' '.join(words[:mid])
             bbox = self.draw.textbbox((0, 0), truncated, font=font)
-            truncated_width = bbox[2] - bbox[0]
-            
-            if truncated_width <= max_width:
-                return truncated
+            if bbox[2] - bbox[0] <= max_width:
+                best = truncated
+                low = mid + 1
+            else:
+                high = mid - 1
+        
+        if best is not None:
+            return best
         
         return words[0] if words else text
     
@@ -582,8 +579,8 @@ class EPaperScreenshotGenerator:
             oneBit_path = os.path.join(screenshots_dir, oneBit_filename)
             self.canvas.save(oneBit_path)
             
-            # RGB version (för enkel visning)
-            rgb_canvas = self.canvas.convert('RGB')
+            # Gråskaleversion för enkel visning ('L' räcker för svartvitt - 1/3 av RGB:s minne)
+            rgb_canvas = self.canvas.convert('L')
             rgb_path = os.path.join(screenshots_dir, output_filename)
             rgb_canvas.save(rgb_path)
             